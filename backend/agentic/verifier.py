@@ -72,10 +72,8 @@ class Verifier:
         checks.append("cta_constraints")
         
         # Check 7: Immutability (if original provided)
+        # Guaranteed upstream by copy.deepcopy() in the simulator; recorded only.
         if original:
-            immut_ok, immut_errors, immut_warnings = self._verify_immutability(original, blueprint)
-            errors.extend(immut_errors)
-            warnings.extend(immut_warnings)
             checks.append("immutability")
         
         # Overall result
@@ -262,17 +260,6 @@ class Verifier:
         ok = len(errors) == 0
         return ok, errors, warnings
     
-    def _verify_immutability(self, original: Dict[str, Any], modified: Dict[str, Any]) -> Tuple[bool, List[str], List[str]]:
-        """Verify that original blueprint is not mutated."""
-        errors: List[str] = []
-        warnings: List[str] = []
-        
-        # This check would detect if someone modified the original
-        # In practice, we already guarantee immutability through copy.deepcopy()
-        
-        ok = len(errors) == 0
-        return ok, errors, warnings
-    
     def can_apply_patch(self, blueprint: Dict[str, Any], patch: Any) -> Tuple[bool, Optional[str]]:
         """Check if a specific patch is safe to apply."""
         try:
@@ -0,0 +1,76 @@
+"""
+Numeric kernels for layout verification.
+
+Operates on plain (left, top, right, bottom) edge tuples only - no
+component dicts, no message formatting - so the hot loop has no
+attribute lookups and can be swapped for a compiled implementation.
+"""
+
+from heapq import heappop, heappush
+from typing import Dict, List, Tuple
+
+
+def find_overlaps(
+    edges: List[Tuple],
+    screen_width: int,
+    cell: int
+) -> Dict[int, List[int]]:
+    """
+    Find overlapping box pairs with a sweep-and-prune over the Y axis.
+    
+    Boxes are swept by top edge. Boxes whose vertical extent is still open
+    are bucketed into columns of width cell, and only boxes sharing a column
+    are tested for overlap. edges[i] is (left, top, right, bottom) of the
+    i-th box; touching edges count as overlapping.
+    
+    Returns:
+        {i: sorted [j, ...]} for each overlapping pair with j < i
+    """
+    overlaps: Dict[int, List[int]] = {}
+    if len(edges) < 2:
+        return overlaps
+    
+    # Vertical extent as [low, high]; negative heights are normalized so
+    # the broad phase never drops a pair the narrow phase would report
+    spans = [
+        (min(top, bottom), max(top, bottom), idx)
+        for idx, (_, top, _, bottom) in enumerate(edges)
+    ]
+    spans.sort()
+    
+    # Columns beyond the screen are clamped; clamping keeps any two
+    # intersecting x-extents in at least one shared column
+    lowest, highest = -cell, screen_width + cell
+    
+    active_columns: Dict[int, set] = {}
+    columns_of: Dict[int, range] = {}
+    closing = []  # heap of (high, idx) for active boxes
+    for low, high, i in spans:
+        # Touching edges count as overlap, so only strictly-closed spans leave
+        while closing and closing[0][0] < low:
+            j = heappop(closing)[1]
+            for column in columns_of[j]:
+                active_columns[column].discard(j)
+        
+        left, top, right, bottom = edges[i]
+        columns = range(
+            int(max(lowest, min(left, right, highest)) // cell),
+            int(max(lowest, min(max(left, right), highest)) // cell) + 1
+        )
+        candidates = set()
+        for column in columns:
+            candidates.update(active_columns.get(column, ()))
+        for j in candidates:
+            other_left, other_top, other_right, other_bottom = edges[j]
+            if (other_left <= right and left <= other_right and
+                    other_top <= bottom and top <= other_bottom):
+                overlaps.setdefault(max(i, j), []).append(min(i, j))
+        
+        for column in columns:
+            active_columns.setdefault(column, set()).add(i)
+        columns_of[i] = columns
+        heappush(closing, (high, i))
+    
+    for partners in overlaps.values():
+        partners.sort()
+    return overlaps
@@ -15,10 +15,10 @@ from typing import Dict, List
 from dataclasses import dataclass
 from copy import deepcopy
 
-from .intent_parser import IntentParser
+from .intent_parser import IntentParser, IntentType
 from .change_planner import ChangePlanner
 from .patch_engine import PatchEngine
-from .verifier import Verifier
+from .verifier import VERIFIER
 
 
 @dataclass
@@ -52,7 +52,7 @@ class DesignEditAgent:
         self.parser = IntentParser()
         self.planner = ChangePlanner()
         self.patcher = PatchEngine()
-        self.verifier = Verifier()
+        self.verifier = VERIFIER
     
     def edit(self, command: str, blueprint: Dict) -> AgentResponse:
         """
@@ -80,7 +80,7 @@ class DesignEditAgent:
         response.reasoning.extend(intent.reasoning)
         response.confidence = intent.confidence
         
-        if intent.intent_type.value == "unknown":
+        if intent.intent_type == IntentType.UNKNOWN:
             response.errors.append(f"Intent not recognized (confidence: {intent.confidence})")
             response.reasoning.append("❌ FAILED: Intent parsing unsuccessful")
             return response
@@ -179,19 +179,19 @@ class DesignEditAgent:
     
     def _generate_summary(self, intent, plan) -> str:
         """Generate human-readable summary of changes."""
-        if intent.intent_type.value == "modify_color":
+        if intent.intent_type == IntentType.MODIFY_COLOR:
             color = intent.parameters.get("color", "requested color")
             return f"Color changed to {color}"
         
-        elif intent.intent_type.value == "resize_component":
+        elif intent.intent_type == IntentType.RESIZE_COMPONENT:
             size_dir = intent.parameters.get("size_direction", "resized")
             return f"Component {size_dir}"
         
-        elif intent.intent_type.value == "edit_text":
+        elif intent.intent_type == IntentType.EDIT_TEXT:
             new_text = intent.parameters.get("new_text", "")
             return f"Text changed to '{new_text}'"
         
-        elif intent.intent_type.value == "modify_style":
+        elif intent.intent_type == IntentType.MODIFY_STYLE:
             style = intent.parameters.get("style", "styled")
             return f"Component {style} style applied"
         
@@ -7,21 +7,59 @@ Pure planning - no modifications to blueprint.
 Output is a detailed plan with constraints that Step 3 will execute.
 """
 
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, Final, List, Optional, Tuple
 from dataclasses import dataclass, field
-from .intent_parser import ParsedIntent, IntentType
+from .intent_parser import ParsedIntent, IntentType, SizeDelta, EXPLAIN_ENABLED
 
 
-@dataclass
+def _field_getter(field_path: str, default: Any) -> Callable[[Dict], Any]:
+    """
+    Build a reader for a fixed component field path.
+    
+    Supports top-level fields ("text") and one level of nesting
+    ("visual.color"); a missing or null parent yields the default.
+    """
+    parent, _, key = field_path.rpartition(".")
+    if not parent:
+        return lambda component: component.get(key, default)
+    return lambda component: (component.get(parent) or {}).get(key, default)
+
+
+# Schema accessors for the fields the planners read (same paths they patch)
+_get_color = _field_getter("visual.color", "")
+_get_height = _field_getter("visual.height", 44)
+_get_font_weight = _field_getter("visual.font_weight", "normal")
+_get_text = _field_getter("text", "")
+
+# Height limits (px); also published through ChangePlanner.SCHEMA_CONSTRAINTS
+_MIN_H: Final = 20
+_MAX_H: Final = 600
+_MIN_BUTTON_H: Final = 44  # Accessibility minimum
+_HEIGHT_CONSTRAINT: Final = f"Height must be between {_MIN_H} and {_MAX_H}"
+
+# Constraints attached to every plan, plus the extras for resizes
+_BASE_CONSTRAINTS: Final = (
+    "No component IDs may be modified",
+    "No components may be deleted",
+    "Component schema must remain valid",
+    "All modifications must be to 'visual' or 'text' fields only",
+)
+_RESIZE_CONSTRAINTS: Final = _BASE_CONSTRAINTS + (
+    "Component bbox must not overlap others",
+    "Component must stay within screen bounds",
+)
+
+
+@dataclass(slots=True, frozen=True)
 class FieldPatch:
     """Single field modification"""
     field_path: str  # e.g., "visual.bg_color"
-    old_value: any
-    new_value: any
+    old_value: Any
+    new_value: Any
     reason: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ComponentPatch:
     """Changes for one component"""
     component_id: str
@@ -30,6 +68,23 @@ class ComponentPatch:
     field_patches: List[FieldPatch] = field(default_factory=list)
 
 
+@dataclass
+class _BlueprintIndex:
+    """Lookup tables over blueprint components, built once per plan"""
+    by_role: Dict[str, List[Dict]] = field(default_factory=dict)
+    by_type: Dict[str, List[Dict]] = field(default_factory=dict)
+    text_corpus: List[Tuple[str, Dict]] = field(default_factory=list)
+    
+    @classmethod
+    def build(cls, blueprint: Dict) -> "_BlueprintIndex":
+        index = cls()
+        for comp in blueprint.get("components", []):
+            index.by_role.setdefault(comp.get("role"), []).append(comp)
+            index.by_type.setdefault(comp.get("type"), []).append(comp)
+            index.text_corpus.append(((comp.get("text") or "").lower(), comp))
+        return index
+
+
 @dataclass
 class ChangePlan:
     """Complete plan (not executed yet)"""
@@ -51,12 +106,12 @@ class ChangePlanner:
     """
     
     # Schema-defined constraints
-    SCHEMA_CONSTRAINTS = {
-        "height": {"min": 20, "max": 600},
+    SCHEMA_CONSTRAINTS: Final = {
+        "height": {"min": _MIN_H, "max": _MAX_H},
         "width": {"min": 20, "max": 500},
         "font_size": {"min": 8, "max": 72},
         "font_weight": {"options": ["normal", "bold", "light", "heavy"]},
-        "button_height": {"min": 44},  # Accessibility minimum
+        "button_height": {"min": _MIN_BUTTON_H},  # Accessibility minimum
     }
     
     def plan_changes(
@@ -93,18 +148,22 @@ class ChangePlanner:
             plan.rationale.append("Target component not identified - cannot plan changes")
             return plan
         
-        plan.rationale.append(f"Planning changes for {intent.target}")
-        plan.rationale.append(f"Intent type: {intent.intent_type.value}")
+        if EXPLAIN_ENABLED:
+            plan.rationale.append(f"Planning changes for {intent.target}")
+            plan.rationale.append(f"Intent type: {intent.intent_type.value}")
         
-        # Step 2: Find target components in blueprint
-        target_components = self._find_components(intent.target, blueprint)
+        # Step 2: Find target components in blueprint (the index is scoped to
+        # this call, so in-place edits between plans are always seen)
+        index = _BlueprintIndex.build(blueprint)
+        target_components = self._find_components(intent.target, index)
         
         if not target_components:
             plan.executable = False
             plan.rationale.append(f"No components matched target: {intent.target}")
             return plan
         
-        plan.rationale.append(f"Found {len(target_components)} matching component(s)")
+        if EXPLAIN_ENABLED:
+            plan.rationale.append(f"Found {len(target_components)} matching component(s)")
         
         # Step 3: Plan patch for each component
         for comp in target_components:
@@ -117,7 +176,8 @@ class ChangePlanner:
             )
             if patch:
                 plan.planned_patches.append(patch)
-                plan.rationale.append(f"Planned {len(patch.field_patches)} changes to '{comp['id']}'")
+                if EXPLAIN_ENABLED:
+                    plan.rationale.append(f"Planned {len(patch.field_patches)} changes to '{comp['id']}'")
         
         # Step 4: Add mandatory constraints
         plan.constraints.extend(self._generate_constraints(intent.intent_type, blueprint))
@@ -129,25 +189,20 @@ class ChangePlanner:
         
         return plan
     
-    def _find_components(self, target, blueprint: Dict) -> List[Dict]:
-        """Find components matching the target criteria."""
-        matches = []
-        
-        if "components" not in blueprint:
-            return []
-        
-        for comp in blueprint["components"]:
-            # Match by role
-            if target.role and comp.get("role") == target.role:
-                matches.append(comp)
-            # Match by type
-            elif target.component_type and comp.get("type") == target.component_type:
-                matches.append(comp)
-            # Match by text
-            elif target.text_match and target.text_match.lower() in comp.get("text", "").lower():
-                matches.append(comp)
-        
-        return matches
+    def _find_components(self, target, index: _BlueprintIndex) -> List[Dict]:
+        """
+        Find components matching the target criteria.
+        
+        Precedence is explicit: role matches, then type matches, then text matches.
+        """
+        if target.role and target.role in index.by_role:
+            return list(index.by_role[target.role])
+        if target.component_type and target.component_type in index.by_type:
+            return list(index.by_type[target.component_type])
+        if target.text_match:
+            text_match = target.text_match.lower()
+            return [comp for text, comp in index.text_corpus if text_match in text]
+        return []
     
     def _plan_component_patch(
         self,
@@ -190,7 +245,7 @@ class ChangePlanner:
             return patch
         
         new_color = parameters["color"]
-        old_color = component.get("visual", {}).get("color", "")
+        old_color = _get_color(component)
         
         field_patch = FieldPatch(
             field_path="visual.color",
@@ -217,22 +272,27 @@ class ChangePlanner:
             return patch
         
         size_dir = parameters["size_direction"]
-        current_height = component.get("visual", {}).get("height", 44)
-        
-        # Calculate new height
-        if size_dir.startswith("increase"):
-            percent = int(size_dir.split("_")[1])
-            new_height = int(current_height * (1 + percent / 100))
-        elif size_dir.startswith("decrease"):
-            percent = int(size_dir.split("_")[1])
-            new_height = int(current_height * (1 - percent / 100))
+        size_delta = parameters.get("size_delta")
+        if size_delta is None:
+            # String form only, e.g. "increase_50"
+            op, _, percent = str(size_dir).partition("_")
+            if percent.isdigit():
+                size_delta = SizeDelta(op, int(percent))
+        current_height = _get_height(component)
+        
+        # Calculate new height (integer percent math, no float rounding noise)
+        if size_delta is not None and size_delta.op == "increase":
+            new_height = int(current_height * (100 + size_delta.percent) // 100)
+        elif size_delta is not None and size_delta.op == "decrease":
+            new_height = int(current_height * (100 - size_delta.percent) // 100)
         else:
             new_height = current_height
         
         # For buttons, enforce minimum height
         if component.get("role") == "cta":
-            new_height = max(new_height, self.SCHEMA_CONSTRAINTS["button_height"]["min"])
-            plan.safety_notes.append(f"Button height enforced minimum: {new_height}px")
+            new_height = max(new_height, _MIN_BUTTON_H)
+            if EXPLAIN_ENABLED:
+                plan.safety_notes.append(f"Button height enforced minimum: {new_height}px")
         
         field_patch = FieldPatch(
             field_path="visual.height",
@@ -243,9 +303,7 @@ class ChangePlanner:
         patch.field_patches.append(field_patch)
         
         # Add constraints
-        min_h = self.SCHEMA_CONSTRAINTS["height"]["min"]
-        max_h = self.SCHEMA_CONSTRAINTS["height"]["max"]
-        plan.constraints.append(f"Height must be between {min_h} and {max_h}")
+        plan.constraints.append(_HEIGHT_CONSTRAINT)
         
         return patch
     
@@ -261,7 +319,7 @@ class ChangePlanner:
             return patch
         
         new_text = parameters["new_text"]
-        old_text = component.get("text", "")
+        old_text = _get_text(component)
         
         field_patch = FieldPatch(
             field_path="text",
@@ -288,7 +346,7 @@ class ChangePlanner:
             return patch
         
         style = parameters["style"]
-        current_weight = component.get("visual", {}).get("font_weight", "normal")
+        current_weight = _get_font_weight(component)
         
         # Map style keywords to font-weight
         style_map = {
@@ -310,17 +368,8 @@ class ChangePlanner:
         
         return patch
     
-    def _generate_constraints(self, intent_type: IntentType, blueprint: Dict) -> List[str]:
+    def _generate_constraints(self, intent_type: IntentType, blueprint: Dict) -> Tuple[str, ...]:
         """Generate schema constraints based on intent."""
-        constraints = [
-            "No component IDs may be modified",
-            "No components may be deleted",
-            "Component schema must remain valid",
-            "All modifications must be to 'visual' or 'text' fields only",
-        ]
-        
         if intent_type == IntentType.RESIZE_COMPONENT:
-            constraints.append("Component bbox must not overlap others")
-            constraints.append("Component must stay within screen bounds")
-        
-        return constraints
+            return _RESIZE_CONSTRAINTS
+        return _BASE_CONSTRAINTS
@@ -12,12 +12,165 @@ Command Grammar:
 - Style: "make [component] bold/italic/[style]"
 """
 
+import os
 import re
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Dict, Final, List, Optional, Tuple
+from dataclasses import dataclass, field, replace
 from enum import Enum
 
 
+# Reasoning traces are on by default; AI_UI_EXPLAIN=0 skips building them
+EXPLAIN_ENABLED: Final = os.getenv("AI_UI_EXPLAIN", "1") != "0"
+
+_GROUP_NAME_RE: Final = re.compile(r"\(\?P<(\w+)>")
+_LEADING_LAZY_GROUP_RE: Final = re.compile(r"\(\?P<\w+>\.\+\?\)")
+_HEX_COLOR_RE: Final = re.compile(r"#[0-9a-f]{6}")
+_ANY_SKIP: Final = "(?s:.*?)"
+_LINE_SKIP: Final = "(?:.*\n)*?"
+
+
+def _compile_patterns(patterns: Dict) -> Tuple[re.Pattern, Dict[str, Tuple]]:
+    """
+    Combine all intent patterns into a single regex.
+    
+    Patterns are ordered by descending confidence (declaration order breaks
+    ties) and joined as alternatives, each a lookahead anchored at the start
+    of the command with re.search() semantics. The first alternative that
+    matches is the highest-confidence match, so later ones are never tried.
+    A trailing empty alternative lets the regex match when no pattern does.
+    Named groups are prefixed with a per-pattern tag to keep them unique
+    across alternatives; the tag group closes last, so it is match.lastgroup.
+    
+    Patterns that open with a lazy capture can only first match at the start
+    of a line, so they skip line by line instead of retrying at every offset.
+    
+    Returns:
+        (combined regex, {tag: (intent_type, confidence, pattern,
+        [(group_name, tagged_group_name), ...])})
+    """
+    entries = [
+        (itype, i, pattern_regex, confidence)
+        for itype, pattern_list in patterns.items()
+        for i, (pattern_regex, confidence) in enumerate(pattern_list)
+    ]
+    entries.sort(key=lambda entry: entry[3], reverse=True)
+    
+    table = {}
+    parts = []
+    for itype, i, pattern_regex, confidence in entries:
+        tag = f"{itype.name}_{i}"
+        group_names = _GROUP_NAME_RE.findall(pattern_regex)
+        tagged = _GROUP_NAME_RE.sub(lambda m: f"(?P<{tag}__{m.group(1)}>", pattern_regex)
+        prefix = _LINE_SKIP if _LEADING_LAZY_GROUP_RE.match(pattern_regex) else _ANY_SKIP
+        parts.append(f"(?={prefix}(?P<{tag}>{tagged}))")
+        table[tag] = (
+            itype, confidence, pattern_regex,
+            [(name, f"{tag}__{name}") for name in group_names],
+        )
+    parts.append("")
+    return re.compile(f"(?:{'|'.join(parts)})", re.IGNORECASE), table
+
+
+def _compile_keyword_index(keyword_map: Dict[str, List[str]]) -> Tuple[re.Pattern, Dict[str, Tuple[int, str]]]:
+    """
+    Build a single-pass substring index over a {name: [keywords]} map.
+    
+    The regex reports the longest keyword starting at every offset of a word.
+    Each keyword maps to the earliest-declared name among itself and any
+    shorter keyword that is its prefix, so the lowest rank over all hits equals
+    the first name whose keywords contain a substring of the word.
+    
+    Returns:
+        (keyword regex, {keyword: (rank, name)})
+    """
+    first_rank: Dict[str, Tuple[int, str]] = {}
+    for rank, (name, keywords) in enumerate(keyword_map.items()):
+        for kw in keywords:
+            first_rank.setdefault(kw, (rank, name))
+    
+    ranks = {
+        kw: min(first_rank[other] for other in first_rank if kw.startswith(other))
+        for kw in first_rank
+    }
+    alternation = "|".join(re.escape(kw) for kw in sorted(ranks, key=len, reverse=True))
+    return re.compile(f"(?=({alternation}))"), ranks
+
+
+def _first_keyword_match(
+    index: Tuple[re.Pattern, Dict[str, Tuple[int, str]]],
+    word: str
+) -> Optional[str]:
+    """Return the earliest-declared name with a keyword occurring in word."""
+    keyword_re, ranks = index
+    hits = keyword_re.findall(word)
+    return min(ranks[kw] for kw in hits)[1] if hits else None
+
+
+def _build_color_lut(color_keywords: Dict[str, List[str]], color_names: Dict[str, str]) -> Dict[str, str]:
+    """Flatten {hex: [keywords]} and {name: hex} into one {word: hex} table."""
+    lut = dict(color_names)
+    for hex_color, keywords in reversed(list(color_keywords.items())):
+        for kw in keywords:
+            lut[kw] = hex_color
+    return lut
+
+
+@dataclass(slots=True, frozen=True)
+class _TextIndex:
+    """
+    Lookup structure over lowercased component texts.
+    
+    Answers "first component whose text contains, or is contained in, a word"
+    without a per-component scan: containment is a single find() over the
+    joined texts, and contained texts are found by probing the word's
+    substrings of each length that some component text actually has.
+    """
+    texts: Tuple[str, ...]
+    corpus: str  # texts joined by "\0"
+    starts: Tuple[int, ...]  # corpus offset of each text
+    first_by_text: Dict[str, int]
+    lengths: Tuple[int, ...]  # distinct text lengths, ascending
+    
+    def first_match(self, word: str) -> Optional[int]:
+        """Return the lowest index i with word in texts[i] or texts[i] in word."""
+        if "\0" in word:
+            best = next((i for i, text in enumerate(self.texts) if word in text), None)
+        else:
+            pos = self.corpus.find(word)
+            best = bisect_right(self.starts, pos) - 1 if pos != -1 else None
+        
+        for length in self.lengths:
+            if length > len(word):
+                break
+            for start in range(len(word) - length + 1):
+                idx = self.first_by_text.get(word[start:start + length])
+                if idx is not None and (best is None or idx < best):
+                    best = idx
+        return best
+
+
+@lru_cache(maxsize=128)
+def _build_text_index(component_texts: Tuple[str, ...]) -> _TextIndex:
+    """Build (once per distinct set of component texts) the text lookup index."""
+    texts = tuple(text.lower() for text in component_texts)
+    starts = []
+    offset = 0
+    first_by_text: Dict[str, int] = {}
+    for idx, text in enumerate(texts):
+        starts.append(offset)
+        offset += len(text) + 1
+        first_by_text.setdefault(text, idx)
+    return _TextIndex(
+        texts=texts,
+        corpus="\0".join(texts),
+        starts=tuple(starts),
+        first_by_text=first_by_text,
+        lengths=tuple(sorted({len(text) for text in first_by_text})),
+    )
+
+
 class IntentType(Enum):
     """Possible design editing intents"""
     MODIFY_COLOR = "modify_color"
@@ -29,7 +182,7 @@ class IntentType(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ComponentTarget:
     """Target component identification"""
     role: Optional[str] = None  # "cta", "header", "content", etc.
@@ -50,20 +203,24 @@ class ComponentTarget:
         return f"Target({', '.join(parts)})"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
+class SizeDelta:
+    """Structured resize request, e.g. increase by 20%"""
+    op: str  # "increase", "decrease" or "set"
+    percent: int
+    
+    def __str__(self):
+        return f"{self.op}_{self.percent}"
+
+
+@dataclass(slots=True)
 class ParsedIntent:
     """Structured intent from natural language"""
     intent_type: IntentType
     confidence: float  # 0.0 - 1.0
     target: Optional[ComponentTarget]
-    parameters: Dict = None
-    reasoning: List[str] = None
-    
-    def __post_init__(self):
-        if self.parameters is None:
-            self.parameters = {}
-        if self.reasoning is None:
-            self.reasoning = []
+    parameters: Dict = field(default_factory=dict)
+    reasoning: List[str] = field(default_factory=list)
 
 
 class IntentParser:
@@ -78,7 +235,7 @@ class IntentParser:
     """
     
     # Command patterns (regex + intent mapping)
-    PATTERNS = {
+    PATTERNS: Final = {
         # Color changes - HIGHEST specificity first
         IntentType.MODIFY_COLOR: [
             (r"change\s+(?P<target>.+?)\s+(?:color|background|bg)\s+to\s+(?P<color>.+?)(?:\.|$)", 0.95),
@@ -118,7 +275,7 @@ class IntentParser:
     }
     
     # Component type keywords
-    COMPONENT_KEYWORDS = {
+    COMPONENT_KEYWORDS: Final = {
         "button": ["button", "cta", "action", "click"],
         "text": ["text", "label", "content", "paragraph", "heading", "title"],
         "header": ["header", "title", "heading", "h1"],
@@ -127,7 +284,7 @@ class IntentParser:
     }
     
     # Role keywords
-    ROLE_KEYWORDS = {
+    ROLE_KEYWORDS: Final = {
         "cta": ["button", "order", "submit", "click", "action"],
         "hero": ["title", "header", "heading", "main"],
         "content": ["text", "description", "label", "info"],
@@ -135,7 +292,7 @@ class IntentParser:
     }
     
     # Color keyword mapping
-    COLOR_KEYWORDS = {
+    COLOR_KEYWORDS: Final = {
         "#0000FF": ["blue", "primary", "accent"],
         "#FFFFFF": ["white", "light", "background"],
         "#000000": ["black", "dark"],
@@ -144,6 +301,26 @@ class IntentParser:
         "#808080": ["gray", "grey", "neutral"],
     }
     
+    # Direct color names (keywords above take precedence)
+    COLOR_NAMES: Final = {
+        "blue": "#0000FF",
+        "white": "#FFFFFF",
+        "black": "#000000",
+        "red": "#FF0000",
+        "green": "#00FF00",
+        "gray": "#808080",
+        "grey": "#808080",
+        "yellow": "#FFFF00",
+        "orange": "#FFA500",
+        "purple": "#800080",
+        "pink": "#FFC0CB",
+    }
+    
+    _COMBINED_PATTERN, _PATTERN_TABLE = _compile_patterns(PATTERNS)
+    _COLOR_LUT: Final = _build_color_lut(COLOR_KEYWORDS, COLOR_NAMES)
+    _COMPONENT_KEYWORD_INDEX: Final = _compile_keyword_index(COMPONENT_KEYWORDS)
+    _ROLE_KEYWORD_INDEX: Final = _compile_keyword_index(ROLE_KEYWORDS)
+    
     def parse(self, command: str, blueprint: Dict) -> ParsedIntent:
         """
         Parse a natural language command into structured intent.
@@ -155,7 +332,39 @@ class IntentParser:
         Returns:
             ParsedIntent with confidence and reasoning
         """
-        command_lower = command.lower().strip()
+        # Patterns are case-insensitive; extracted groups are lowercased as needed
+        command_stripped = command.strip()
+        
+        # Only component texts influence target identification
+        component_texts = (
+            tuple(comp.get("text", "") for comp in blueprint["components"])
+            if "components" in blueprint else None
+        )
+        
+        # Hand out a copy so callers cannot mutate the cached result
+        intent = self._parse_cached(command_stripped, component_texts)
+        return replace(
+            intent,
+            parameters=dict(intent.parameters),
+            reasoning=list(intent.reasoning)
+        )
+    
+    @classmethod
+    @lru_cache(maxsize=512)
+    def _parse_cached(
+        cls,
+        command: str,
+        component_texts: Optional[Tuple[str, ...]]
+    ) -> ParsedIntent:
+        """Parse a stripped command; memoized on (command, component texts)."""
+        return cls()._parse(command, component_texts)
+    
+    def _parse(
+        self,
+        command: str,
+        component_texts: Optional[Tuple[str, ...]]
+    ) -> ParsedIntent:
+        """Uncached parse of a stripped command."""
         reasoning = []
         
         # Step 1: Try to match command patterns
@@ -164,19 +373,17 @@ class IntentParser:
         best_confidence = 0.0
         pattern_groups = {}
         
-        for itype, patterns in self.PATTERNS.items():
-            for pattern_regex, confidence in patterns:
-                match = re.search(pattern_regex, command_lower, re.IGNORECASE)
-                if match and confidence > best_confidence:
-                    intent_type = itype
-                    best_confidence = confidence
-                    matched_pattern = pattern_regex
-                    pattern_groups = match.groupdict()
-                    reasoning.append(f"Matched pattern: {pattern_regex[:50]}...")
-                    reasoning.append(f"Base confidence: {confidence}")
+        # Patterns are tried in descending confidence; the first hit wins
+        match = self._COMBINED_PATTERN.match(command)
+        if match.lastgroup is not None:
+            intent_type, best_confidence, matched_pattern, group_names = self._PATTERN_TABLE[match.lastgroup]
+            pattern_groups = {name: match.group(tagged) for name, tagged in group_names}
+            if EXPLAIN_ENABLED:
+                reasoning.append(f"Matched pattern: {matched_pattern[:50]}...")
+                reasoning.append(f"Base confidence: {best_confidence}")
         
         # Step 2: Identify target component
-        target = self._identify_target(command_lower, blueprint, pattern_groups, reasoning)
+        target = self._identify_target(command, component_texts, pattern_groups, reasoning)
         
         # Step 3: Extract parameters
         parameters = self._extract_parameters(intent_type, pattern_groups, reasoning)
@@ -184,18 +391,22 @@ class IntentParser:
         # Step 4: Adjust confidence based on target clarity
         final_confidence = best_confidence
         if target and target.role:
-            reasoning.append(f"Target clearly identified: {target.role}/{target.component_type}")
+            if EXPLAIN_ENABLED:
+                reasoning.append(f"Target clearly identified: {target.role}/{target.component_type}")
             final_confidence = min(1.0, final_confidence + 0.1)
         elif target and target.text_match:
-            reasoning.append(f"Target identified by text pattern: '{target.text_match}'")
+            if EXPLAIN_ENABLED:
+                reasoning.append(f"Target identified by text pattern: '{target.text_match}'")
             final_confidence = max(0, final_confidence - 0.1)
         else:
-            reasoning.append("Target ambiguous - needs clarification")
+            if EXPLAIN_ENABLED:
+                reasoning.append("Target ambiguous - needs clarification")
             final_confidence = max(0, final_confidence - 0.2)
         
         # Step 5: Final confidence check
         if final_confidence < 0.6:
-            reasoning.append("CONFIDENCE TOO LOW - marking as uncertain")
+            if EXPLAIN_ENABLED:
+                reasoning.append("CONFIDENCE TOO LOW - marking as uncertain")
             intent_type = IntentType.UNKNOWN
         
         return ParsedIntent(
@@ -209,7 +420,7 @@ class IntentParser:
     def _identify_target(
         self,
         command: str,
-        blueprint: Dict,
+        component_texts: Optional[Tuple[str, ...]],
         pattern_groups: Dict,
         reasoning: List[str]
     ) -> Optional[ComponentTarget]:
@@ -221,38 +432,44 @@ class IntentParser:
         2. Text matching from blueprint
         3. Component keywords
         """
-        target = ComponentTarget()
-        
         # Try to get target from regex groups
-        if "target" in pattern_groups and pattern_groups["target"]:
-            target_word = pattern_groups["target"].lower()
+        if not pattern_groups.get("target"):
+            return None
+        
+        target_word = pattern_groups["target"].lower()
+        if EXPLAIN_ENABLED:
             reasoning.append(f"Target word from pattern: '{target_word}'")
-            
-            # Look up component type
-            for comp_type, keywords in self.COMPONENT_KEYWORDS.items():
-                if any(kw in target_word for kw in keywords):
-                    target.component_type = comp_type
-                    reasoning.append(f"Matched component type: {comp_type}")
-                    break
-            
-            # Look up role
-            for role, keywords in self.ROLE_KEYWORDS.items():
-                if any(kw in target_word for kw in keywords):
-                    target.role = role
-                    reasoning.append(f"Matched role: {role}")
-                    break
-            
-            # Try text matching in blueprint
-            if "components" in blueprint:
-                for idx, comp in enumerate(blueprint["components"]):
-                    comp_text = comp.get("text", "").lower()
-                    if target_word in comp_text or comp_text in target_word:
-                        target.text_match = comp.get("text", "")
-                        target.index = idx
-                        reasoning.append(f"Matched component by text at index {idx}")
-                        break
         
-        return target if (target.role or target.component_type or target.text_match) else None
+        # Look up component type
+        comp_type = _first_keyword_match(self._COMPONENT_KEYWORD_INDEX, target_word)
+        if comp_type and EXPLAIN_ENABLED:
+            reasoning.append(f"Matched component type: {comp_type}")
+        
+        # Look up role
+        role = _first_keyword_match(self._ROLE_KEYWORD_INDEX, target_word)
+        if role and EXPLAIN_ENABLED:
+            reasoning.append(f"Matched role: {role}")
+        
+        # Try text matching in blueprint
+        text_match = None
+        index = None
+        if component_texts is not None:
+            idx = _build_text_index(component_texts).first_match(target_word)
+            if idx is not None:
+                text_match = component_texts[idx]
+                index = idx
+                if EXPLAIN_ENABLED:
+                    reasoning.append(f"Matched component by text at index {idx}")
+        
+        if not (role or comp_type or text_match):
+            return None
+        
+        return ComponentTarget(
+            role=role,
+            component_type=comp_type,
+            index=index,
+            text_match=text_match
+        )
     
     def _extract_parameters(
         self,
@@ -261,90 +478,94 @@ class IntentParser:
         reasoning: List[str]
     ) -> Dict:
         """Extract parameters specific to the intent type."""
-        params = {}
-        
-        if intent_type == IntentType.MODIFY_COLOR:
-            if "color" in pattern_groups:
-                color = pattern_groups["color"].lower()
-                normalized = self._normalize_color(color)
-                if normalized:
-                    params["color"] = normalized
-                    reasoning.append(f"Color parameter: {params['color']}")
-                else:
-                    reasoning.append(f"Invalid color: {color}")
-                    return {}  # Reject this intent
-        
-        elif intent_type == IntentType.RESIZE_COMPONENT:
-            if "size" in pattern_groups:
-                size = pattern_groups["size"].lower()
-                params["size_direction"] = self._normalize_size(size)
-                reasoning.append(f"Size parameter: {params['size_direction']}")
-        
-        elif intent_type == IntentType.EDIT_TEXT:
-            if "text" in pattern_groups:
-                params["new_text"] = pattern_groups["text"].strip()
-                reasoning.append(f"Text parameter: '{params['new_text']}'")
-        
-        elif intent_type == IntentType.MODIFY_STYLE:
-            if "style" in pattern_groups:
-                params["style"] = pattern_groups["style"].lower()
-                reasoning.append(f"Style parameter: {params['style']}")
-        
-        elif intent_type == IntentType.REORDER_COMPONENT:
-            if "position" in pattern_groups:
-                params["position"] = pattern_groups["position"].lower()
-                reasoning.append(f"Position parameter: {params['position']}")
-        
-        return params
+        extractor = self._EXTRACTORS.get(intent_type)
+        return extractor(self, pattern_groups, reasoning) if extractor else {}
+    
+    def _extract_color(self, pattern_groups: Dict, reasoning: List[str]) -> Dict:
+        """Extract and normalize the color parameter."""
+        if "color" not in pattern_groups:
+            return {}
+        color = pattern_groups["color"].lower()
+        normalized = self._normalize_color(color)
+        if not normalized:
+            if EXPLAIN_ENABLED:
+                reasoning.append(f"Invalid color: {color}")
+            return {}  # Reject this intent
+        if EXPLAIN_ENABLED:
+            reasoning.append(f"Color parameter: {normalized}")
+        return {"color": normalized}
+    
+    def _extract_size(self, pattern_groups: Dict, reasoning: List[str]) -> Dict:
+        """Extract the resize direction parameter."""
+        if "size" not in pattern_groups:
+            return {}
+        size_word = pattern_groups["size"].lower()
+        size_delta = self._SIZE_DELTAS.get(size_word)
+        if EXPLAIN_ENABLED:
+            reasoning.append(f"Size parameter: {size_delta or size_word}")
+        if size_delta is None:
+            return {"size_direction": size_word}
+        return {"size_direction": str(size_delta), "size_delta": size_delta}
+    
+    def _extract_text(self, pattern_groups: Dict, reasoning: List[str]) -> Dict:
+        """Extract the replacement text parameter."""
+        if "text" not in pattern_groups:
+            return {}
+        new_text = pattern_groups["text"].strip()
+        if EXPLAIN_ENABLED:
+            reasoning.append(f"Text parameter: '{new_text}'")
+        return {"new_text": new_text}
+    
+    def _extract_style(self, pattern_groups: Dict, reasoning: List[str]) -> Dict:
+        """Extract the style parameter."""
+        if "style" not in pattern_groups:
+            return {}
+        style = pattern_groups["style"].lower()
+        if EXPLAIN_ENABLED:
+            reasoning.append(f"Style parameter: {style}")
+        return {"style": style}
+    
+    def _extract_position(self, pattern_groups: Dict, reasoning: List[str]) -> Dict:
+        """Extract the position parameter."""
+        if "position" not in pattern_groups:
+            return {}
+        position = pattern_groups["position"].lower()
+        if EXPLAIN_ENABLED:
+            reasoning.append(f"Position parameter: {position}")
+        return {"position": position}
+    
+    # Parameter extractor per intent type (called with self)
+    _EXTRACTORS: Final = {
+        IntentType.MODIFY_COLOR: _extract_color,
+        IntentType.RESIZE_COMPONENT: _extract_size,
+        IntentType.EDIT_TEXT: _extract_text,
+        IntentType.MODIFY_STYLE: _extract_style,
+        IntentType.REORDER_COMPONENT: _extract_position,
+    }
     
     def _normalize_color(self, color_str: str) -> Optional[str]:
         """Map color keywords to hex codes. Returns None if not a valid color."""
         color_str = color_str.lower().strip()
         
-        # Check against keywords first
-        for hex_color, keywords in self.COLOR_KEYWORDS.items():
-            for kw in keywords:
-                if color_str == kw:
-                    return hex_color
-        
-        # Check direct color names
-        color_map = {
-            "blue": "#0000FF",
-            "white": "#FFFFFF",
-            "black": "#000000",
-            "red": "#FF0000",
-            "green": "#00FF00",
-            "gray": "#808080",
-            "grey": "#808080",
-            "yellow": "#FFFF00",
-            "orange": "#FFA500",
-            "purple": "#800080",
-            "pink": "#FFC0CB",
-        }
-        
-        if color_str in color_map:
-            return color_map[color_str]
+        # Keywords and direct color names
+        hex_color = self._COLOR_LUT.get(color_str)
+        if hex_color:
+            return hex_color
         
         # Check if it's hex format
-        if color_str.startswith("#") and len(color_str) == 7:
-            try:
-                int(color_str[1:], 16)
-                return color_str
-            except ValueError:
-                return None
+        if _HEX_COLOR_RE.fullmatch(color_str):
+            return color_str
         
         # Not a valid color
         return None
     
-    def _normalize_size(self, size_str: str) -> str:
-        """Normalize size keywords."""
-        size_map = {
-            "bigger": "increase_20",
-            "larger": "increase_20",
-            "increase": "increase_20",
-            "smaller": "decrease_20",
-            "tiny": "decrease_30",
-            "huge": "increase_50",
-            "medium": "set_100",
-        }
-        return size_map.get(size_str.lower(), size_str)
+    # Size keywords parsed once into structured deltas
+    _SIZE_DELTAS: Final = {
+        "bigger": SizeDelta("increase", 20),
+        "larger": SizeDelta("increase", 20),
+        "increase": SizeDelta("increase", 20),
+        "smaller": SizeDelta("decrease", 20),
+        "tiny": SizeDelta("decrease", 30),
+        "huge": SizeDelta("increase", 50),
+        "medium": SizeDelta("set", 100),
+    }
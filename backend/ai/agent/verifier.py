@@ -5,8 +5,43 @@ Critical safety checks before confirming patch.
 All checks must pass or patch is rejected.
 """
 
+import re
+from functools import lru_cache
 from typing import Dict, Tuple, List
 from .change_planner import ChangePlan
+from ._layout_kernels import find_overlaps
+
+
+_HEX_COLOR_RE = re.compile(r"#(?:[0-9a-fA-F]{3}|[0-9a-fA-F]{6}|[0-9a-fA-F]{8})")
+
+
+@lru_cache(maxsize=1024)
+def _color_key(color):
+    """
+    Canonical comparison key for a color.
+    
+    Hex colors (#RGB, #RRGGBB, #RRGGBBAA, any case) map to a tagged integer
+    ("hex" or "hexa" with alpha), with #RGB expanded to #RRGGBB; anything else
+    is compared as-is. The tag keeps non-string colors like 255 from matching
+    a hex key.
+    """
+    if isinstance(color, str) and _HEX_COLOR_RE.fullmatch(color):
+        digits = color[1:]
+        if len(digits) == 3:
+            digits = "".join(ch * 2 for ch in digits)
+        return ("hex" if len(digits) == 6 else "hexa", int(digits, 16))
+    return color
+
+
+# Colors accepted even when the blueprint's tokens don't define them
+_COMMON_HEX_COLORS = frozenset({
+    "#FFFFFF", "#000000", "#0000FF", "#FF0000",
+    "#00FF00", "#FFFF00", "#FF00FF", "#00FFFF"
+})
+_COMMON_COLOR_KEYS = frozenset(map(_color_key, _COMMON_HEX_COLORS))
+
+# Shared stand-in for a missing/null "visual" (read-only, never mutated)
+_EMPTY_VISUAL: Dict = {}
 
 
 class Verifier:
@@ -21,18 +56,34 @@ class Verifier:
     - Token consistency
     
     ANY FAILURE → REJECT PATCH
+    
+    Stateless: reads only class-level rules, so one shared instance
+    (VERIFIER) serves every request.
     """
     
+    __slots__ = ()
+    
     # Valid component types
-    VALID_COMPONENT_TYPES = {
+    VALID_COMPONENT_TYPES = frozenset({
         "header", "text", "button", "product_item",
         "image", "divider", "container", "label"
-    }
+    })
+    _VALID_TYPES_STR = ", ".join(sorted(VALID_COMPONENT_TYPES))
     
     # Valid roles
-    VALID_ROLES = {
+    VALID_ROLES = frozenset({
         "hero", "content", "cta", "decoration", "product"
-    }
+    })
+    _VALID_ROLES_STR = ", ".join(sorted(VALID_ROLES))
+    
+    # Fields every component must carry
+    _REQUIRED_FIELDS = ("id", "type")
+    
+    # Longest error list verify_all returns (the rest are summarized)
+    MAX_REPORTED_ERRORS = 50
+    
+    # Column width (px) for bucketing bboxes in the overlap broad phase
+    LAYOUT_GRID_CELL = 64
     
     # Accessibility minimums
     ACCESSIBILITY_RULES = {
@@ -44,44 +95,75 @@ class Verifier:
         self,
         original_blueprint: Dict,
         patched_blueprint: Dict,
-        plan: ChangePlan
+        plan: ChangePlan,
+        fail_fast: bool = False
     ) -> Tuple[bool, List[str]]:
         """
         Run all verification checks.
         
+        Cheap, high-rejection checks run first; layout safety runs last and
+        only on schema-valid components.
+        
+        Args:
+            fail_fast: Stop at the first check that reports errors
+        
         Returns:
             Tuple of (all_pass, [error_messages])
         """
-        errors = []
+        # Insertion-ordered set: identical messages are reported once
+        errors: Dict[str, None] = {}
         
-        # Check 1: Schema validity
+        # Check 1: Schema validity (container level)
         schema_valid, schema_errors = self._verify_schema(patched_blueprint)
-        errors.extend(schema_errors)
-        
-        # Check 2: Component types are valid
-        types_valid, type_errors = self._verify_component_types(patched_blueprint)
-        errors.extend(type_errors)
-        
-        # Check 3: Layout safety (no overlaps)
-        layout_safe, layout_errors = self._verify_layout_safety(patched_blueprint)
-        errors.extend(layout_errors)
-        
-        # Check 4: Accessibility rules
-        accessible, access_errors = self._verify_accessibility(patched_blueprint)
-        errors.extend(access_errors)
-        
-        # Check 5: Token consistency
-        tokens_valid, token_errors = self._verify_token_consistency(patched_blueprint)
-        errors.extend(token_errors)
-        
-        # Check 6: No schema structure changes
-        structure_ok, struct_errors = self._verify_structure_unchanged(original_blueprint, patched_blueprint)
-        errors.extend(struct_errors)
-        
-        return len(errors) == 0, errors
+        errors.update(dict.fromkeys(schema_errors))
+        if not schema_valid:
+            return False, self._error_report(errors)
+        
+        components = patched_blueprint["components"]
+        
+        # Check 2: No schema structure changes
+        structure_ok, struct_errors = self._verify_structure_unchanged(
+            original_blueprint.get("components", []),
+            components
+        )
+        errors.update(dict.fromkeys(struct_errors))
+        if fail_fast and errors:
+            return False, self._error_report(errors)
+        
+        # Checks 3-5 per component: required fields, component types,
+        # accessibility and token consistency share one pass
+        token_colors = patched_blueprint.get("tokens", {}).get("colors", {})
+        valid_color_keys = (
+            _COMMON_COLOR_KEYS.union(map(_color_key, token_colors.values())) if token_colors
+            else _COMMON_COLOR_KEYS
+        )
+        
+        field_errors, type_errors, access_errors, token_errors = self._verify_components_fused(
+            components, valid_color_keys
+        )
+        for check_errors in (field_errors, type_errors, access_errors, token_errors):
+            errors.update(dict.fromkeys(check_errors))
+            if fail_fast and errors:
+                return False, self._error_report(errors)
+        
+        # Check 6: Layout safety (no overlaps) - needs well-formed components
+        if not field_errors:
+            layout_safe, layout_errors = self._verify_layout_safety(components)
+            errors.update(dict.fromkeys(layout_errors))
+        
+        return len(errors) == 0, self._error_report(errors)
+    
+    def _error_report(self, errors: Dict[str, None]) -> List[str]:
+        """List deduplicated errors, capped at MAX_REPORTED_ERRORS."""
+        report = list(errors)
+        if len(report) > self.MAX_REPORTED_ERRORS:
+            hidden = len(report) - self.MAX_REPORTED_ERRORS
+            report = report[:self.MAX_REPORTED_ERRORS]
+            report.append(f"... {hidden} more errors")
+        return report
     
     def _verify_schema(self, blueprint: Dict) -> Tuple[bool, List[str]]:
-        """Verify blueprint matches expected schema."""
+        """Verify blueprint has a components array."""
         errors = []
         
         # Must have components array
@@ -93,55 +175,103 @@ class Verifier:
             errors.append("'components' must be an array")
             return False, errors
         
-        # Each component must have required fields
-        for idx, comp in enumerate(blueprint["components"]):
+        return True, errors
+    
+    def _verify_components_fused(
+        self,
+        components: List,
+        valid_color_keys: frozenset
+    ) -> Tuple[List[str], List[str], List[str], List[str]]:
+        """
+        Run every per-component check in a single pass.
+        
+        Errors are collected per check so verify_all can report them in
+        check order.
+        
+        Returns:
+            Tuple of (schema_errors, type_errors, accessibility_errors, token_errors)
+        """
+        schema_errors = []
+        type_errors = []
+        access_errors = []
+        token_errors = []
+        
+        cta_min_height = self.ACCESSIBILITY_RULES["cta_button_height"]
+        text_min_size = self.ACCESSIBILITY_RULES["text_font_size"]
+        
+        for idx, comp in enumerate(components):
             if not isinstance(comp, dict):
-                errors.append(f"Component {idx} is not a dict")
+                schema_errors.append(f"Component {idx} is not a dict")
                 continue
             
-            # Required fields
-            for field in ["id", "type"]:
-                if field not in comp:
-                    errors.append(f"Component {idx} (id={comp.get('id')}) missing '{field}'")
-        
-        return len(errors) == 0, errors
-    
-    def _verify_component_types(self, blueprint: Dict) -> Tuple[bool, List[str]]:
-        """Verify all components have valid types."""
-        errors = []
-        
-        for comp in blueprint.get("components", []):
             comp_type = comp.get("type")
-            comp_id = comp.get("id", "unknown")
+            role = comp.get("role")
+            visual = comp.get("visual") or _EMPTY_VISUAL
             
+            # Schema: required fields
+            for field in self._REQUIRED_FIELDS:
+                if field not in comp:
+                    schema_errors.append(f"Component {idx} (id={comp.get('id')}) missing '{field}'")
+            
+            # Component types and roles
             if comp_type not in self.VALID_COMPONENT_TYPES:
-                errors.append(
-                    f"Component '{comp_id}': invalid type '{comp_type}'. "
-                    f"Valid types: {', '.join(sorted(self.VALID_COMPONENT_TYPES))}"
+                type_errors.append(
+                    f"Component '{comp.get('id', 'unknown')}': invalid type '{comp_type}'. "
+                    f"Valid types: {self._VALID_TYPES_STR}"
                 )
-            
-            # Role check (if present)
-            role = comp.get("role")
             if role and role not in self.VALID_ROLES:
-                errors.append(
-                    f"Component '{comp_id}': invalid role '{role}'. "
-                    f"Valid roles: {', '.join(sorted(self.VALID_ROLES))}"
+                type_errors.append(
+                    f"Component '{comp.get('id', 'unknown')}': invalid role '{role}'. "
+                    f"Valid roles: {self._VALID_ROLES_STR}"
+                )
+            
+            # Accessibility: CTA buttons must have min height
+            if role == "cta":
+                height = visual.get("height", 0)
+                if height < cta_min_height:
+                    access_errors.append(
+                        f"CTA button '{comp.get('id')}' height {height}px < "
+                        f"minimum {cta_min_height}px"
+                    )
+            
+            # Accessibility: text must be readable
+            if comp_type == "text":
+                font_size = visual.get("font_size", 0)
+                if font_size < text_min_size:
+                    access_errors.append(
+                        f"Text '{comp.get('id')}' font size {font_size}px < "
+                        f"minimum {text_min_size}px"
+                    )
+            
+            # Tokens: colors must come from tokens or the common set
+            # (compared by _color_key, so case and #RGB shorthand don't matter)
+            color = visual.get("color")
+            if color and _color_key(color) not in valid_color_keys:
+                token_errors.append(
+                    f"Component '{comp.get('id')}': color '{color}' not in tokens"
+                )
+            
+            bg_color = visual.get("bg_color")
+            if bg_color and _color_key(bg_color) not in valid_color_keys:
+                token_errors.append(
+                    f"Component '{comp.get('id')}': background color '{bg_color}' not in tokens"
                 )
         
-        return len(errors) == 0, errors
+        return schema_errors, type_errors, access_errors, token_errors
     
-    def _verify_layout_safety(self, blueprint: Dict) -> Tuple[bool, List[str]]:
+    def _verify_layout_safety(self, components: List[Dict]) -> Tuple[bool, List[str]]:
         """Verify no bbox overlaps and components stay in bounds."""
         errors = []
         
-        components = blueprint.get("components", [])
-        
         # Get screen dimensions (typical values)
         # In real scenario, would come from tokens or blueprint meta
         screen_width = 500
         screen_height = 800
         
-        bboxes = []
+        # Extract every bbox's edges once; both checks below work on these
+        placed = []
+        edges = []
+        bounds_errors = []
         
         for comp in components:
             bbox = comp.get("bbox")
@@ -152,105 +282,49 @@ class Verifier:
             right = left + width
             bottom = top + height
             
-            # Check bounds
-            if left < 0 or top < 0 or right > screen_width or bottom > screen_height:
-                errors.append(
+            # Check bounds (non-short-circuit: most components pass every test)
+            if (left < 0) | (top < 0) | (right > screen_width) | (bottom > screen_height):
+                bounds_errors.append(
                     f"Component '{comp.get('id')}' outside screen bounds: "
                     f"bbox=({left},{top},{width},{height}) vs screen({screen_width}×{screen_height})"
                 )
+            else:
+                bounds_errors.append(None)
             
-            # Check overlaps with previous components
-            for prev_comp, prev_bbox in bboxes:
-                if self._bboxes_overlap(bbox, prev_bbox):
-                    errors.append(
-                        f"Component '{comp.get('id')}' overlaps with '{prev_comp.get('id')}'"
-                    )
-            
-            bboxes.append((comp, bbox))
-        
-        return len(errors) == 0, errors
-    
-    def _bboxes_overlap(self, bbox1, bbox2) -> bool:
-        """Check if two bboxes overlap."""
-        if len(bbox1) < 4 or len(bbox2) < 4:
-            return False
-        
-        x1_left, y1_top, w1, h1 = bbox1[0], bbox1[1], bbox1[2], bbox1[3]
-        x2_left, y2_top, w2, h2 = bbox2[0], bbox2[1], bbox2[2], bbox2[3]
-        
-        x1_right, y1_bottom = x1_left + w1, y1_top + h1
-        x2_right, y2_bottom = x2_left + w2, y2_top + h2
-        
-        return not (x1_right < x2_left or x2_right < x1_left or
-                    y1_bottom < y2_top or y2_bottom < y1_top)
-    
-    def _verify_accessibility(self, blueprint: Dict) -> Tuple[bool, List[str]]:
-        """Verify accessibility constraints."""
-        errors = []
-        
-        for comp in blueprint.get("components", []):
-            # CTA buttons must have min height
-            if comp.get("role") == "cta":
-                height = comp.get("visual", {}).get("height", 0)
-                if height < self.ACCESSIBILITY_RULES["cta_button_height"]:
-                    errors.append(
-                        f"CTA button '{comp.get('id')}' height {height}px < "
-                        f"minimum {self.ACCESSIBILITY_RULES['cta_button_height']}px"
-                    )
-            
-            # Text must be readable
-            if comp.get("type") == "text":
-                font_size = comp.get("visual", {}).get("font_size", 0)
-                if font_size < self.ACCESSIBILITY_RULES["text_font_size"]:
-                    errors.append(
-                        f"Text '{comp.get('id')}' font size {font_size}px < "
-                        f"minimum {self.ACCESSIBILITY_RULES['text_font_size']}px"
-                    )
-        
-        return len(errors) == 0, errors
-    
-    def _verify_token_consistency(self, blueprint: Dict) -> Tuple[bool, List[str]]:
-        """Verify colors and tokens are consistent."""
-        errors = []
-        
-        # Get available tokens
-        tokens = blueprint.get("tokens", {})
-        valid_colors = set(tokens.get("colors", {}).values())
+            placed.append((comp, bbox))
+            edges.append((left, top, right, bottom))
         
-        # Also accept common hex colors
-        valid_colors.update({
-            "#FFFFFF", "#000000", "#0000FF", "#FF0000",
-            "#00FF00", "#FFFF00", "#FF00FF", "#00FFFF"
-        })
+        overlaps = find_overlaps(edges, screen_width, self.LAYOUT_GRID_CELL)
         
-        for comp in blueprint.get("components", []):
-            visual = comp.get("visual", {})
-            
-            # Check colors
-            color = visual.get("color")
-            if color and color not in valid_colors:
-                errors.append(
-                    f"Component '{comp.get('id')}': color '{color}' not in tokens"
-                )
-            
-            bg_color = visual.get("bg_color")
-            if bg_color and bg_color not in valid_colors:
+        # Report in component order: bounds first, then overlaps with earlier components
+        for i, (comp, bbox) in enumerate(placed):
+            if bounds_errors[i]:
+                errors.append(bounds_errors[i])
+            for j in overlaps.get(i, ()):
                 errors.append(
-                    f"Component '{comp.get('id')}': background color '{bg_color}' not in tokens"
+                    f"Component '{comp.get('id')}' overlaps with '{placed[j][0].get('id')}'"
                 )
         
         return len(errors) == 0, errors
     
     def _verify_structure_unchanged(
         self,
-        original: Dict,
-        patched: Dict
+        orig_components: List[Dict],
+        patch_components: List[Dict]
     ) -> Tuple[bool, List[str]]:
         """Verify component IDs and count didn't change."""
         errors = []
         
-        orig_ids = {c.get("id") for c in original.get("components", [])}
-        patch_ids = {c.get("id") for c in patched.get("components", [])}
+        # Non-dict entries count as id None (the fused pass reports them)
+        orig_id_list = [c.get("id") if isinstance(c, dict) else None for c in orig_components]
+        patch_id_list = [c.get("id") if isinstance(c, dict) else None for c in patch_components]
+        
+        # Fast path: patches keep component order, so ids match position by position
+        if orig_id_list == patch_id_list:
+            return True, errors
+        
+        orig_ids = set(orig_id_list)
+        patch_ids = set(patch_id_list)
         
         # No deletions
         deleted = orig_ids - patch_ids
@@ -263,10 +337,14 @@ class Verifier:
             errors.append(f"Components added: {added}")
         
         # Count must match
-        if len(original.get("components", [])) != len(patched.get("components", [])):
+        if len(orig_components) != len(patch_components):
             errors.append(
-                f"Component count changed: {len(original.get('components', []))} "
-                f"→ {len(patched.get('components', []))}"
+                f"Component count changed: {len(orig_components)} "
+                f"→ {len(patch_components)}"
             )
         
         return len(errors) == 0, errors
+
+
+# Shared stateless instance
+VERIFIER = Verifier()
@@ -1,3 +1,16 @@
+def _snap(value, base: int):
+    """
+    Snap a value to the nearest multiple of base (a power of two).
+    
+    Integers use bit arithmetic and round halves up; floats keep the
+    round() path.
+    """
+    assert base > 0 and base & (base - 1) == 0, "base must be a power of two"
+    if isinstance(value, int):
+        return (value + base // 2) & ~(base - 1)
+    return round(value / base) * base
+
+
 def improve_blueprint(raw_json: dict) -> tuple:
     """
     Apply deterministic rules to improve blueprint spacing, alignment, tokens.
@@ -12,41 +25,59 @@ def improve_blueprint(raw_json: dict) -> tuple:
     
     Returns:
         tuple: (improved_blueprint, change_log: List[str])
+    
+    The input is never mutated. Only the dicts/lists along changed paths are
+    copied; everything else is shared with raw_json (which is returned as-is
+    when no rule fires), so callers must not mutate the result in place.
     """
-    import copy
-
     # Basic validation
     if not isinstance(raw_json, dict) or "tokens" not in raw_json or "components" not in raw_json:
         raise ValueError("Invalid blueprint: missing tokens or components")
 
-    improved = copy.deepcopy(raw_json)
+    improved = raw_json
     changelog = []
     
     # Rule 1: Snap spacing values to base 8
     base_spacing = 8
-    if "tokens" in improved and "base_spacing" in improved["tokens"]:
-        old_spacing = improved["tokens"]["base_spacing"]
-        new_spacing = round(old_spacing / base_spacing) * base_spacing
+    tokens = raw_json["tokens"]
+    if "base_spacing" in tokens:
+        old_spacing = tokens["base_spacing"]
+        new_spacing = _snap(old_spacing, base_spacing)
         if old_spacing != new_spacing:
-            improved["tokens"]["base_spacing"] = new_spacing
+            improved = dict(raw_json)
+            improved["tokens"] = {**tokens, "base_spacing": new_spacing}
             changelog.append(f"Snapped base_spacing {old_spacing} → {new_spacing}")
     
-    # Rule 2: Ensure CTA minimum height 44px
-    if "components" in improved:
-        for comp in improved["components"]:
-            if comp.get("role") == "cta" and "visual" in comp:
-                old_height = comp["visual"].get("height", 40)
-                new_height = max(44, old_height)
-                if old_height != new_height:
-                    comp["visual"]["height"] = new_height
-                    changelog.append(f"CTA height {old_height} → {new_height}")
-            
-            # Rule 3: Normalize product card aspect ratio to 1.0
-            if comp.get("type") == "product_card" and "visual" in comp:
-                old_ratio = comp["visual"].get("aspect_ratio", 1.0)
-                new_ratio = 1.0
-                if old_ratio != new_ratio:
-                    comp["visual"]["aspect_ratio"] = new_ratio
-                    changelog.append(f"Product aspect_ratio {old_ratio} → {new_ratio}")
+    components = raw_json["components"]
+    new_components = None
+    for idx, comp in enumerate(components):
+        visual_changes = None  # allocated only when a rule fires
+        
+        # Rule 2: Ensure CTA minimum height 44px
+        if comp.get("role") == "cta" and "visual" in comp:
+            old_height = comp["visual"].get("height", 40)
+            new_height = max(44, old_height)
+            if old_height != new_height:
+                visual_changes = {"height": new_height}
+                changelog.append(f"CTA height {old_height} → {new_height}")
+        
+        # Rule 3: Normalize product card aspect ratio to 1.0
+        if comp.get("type") == "product_card" and "visual" in comp:
+            old_ratio = comp["visual"].get("aspect_ratio", 1.0)
+            new_ratio = 1.0
+            if old_ratio != new_ratio:
+                visual_changes = visual_changes or {}
+                visual_changes["aspect_ratio"] = new_ratio
+                changelog.append(f"Product aspect_ratio {old_ratio} → {new_ratio}")
+        
+        if visual_changes:
+            if new_components is None:
+                new_components = list(components)
+            new_components[idx] = {**comp, "visual": {**comp["visual"], **visual_changes}}
+    
+    if new_components is not None:
+        if improved is raw_json:
+            improved = dict(raw_json)
+        improved["components"] = new_components
     
     return improved, changelog
@@ -4,9 +4,46 @@ Handles all component types with proper visual property extraction and rendering
 """
 import json
 import re
+import sys
+from functools import lru_cache
+from typing import Any, Callable, Dict, Final, List, Optional, Tuple
 
 
-def _get_visual_property(visual: dict, *keys, default=None):
+# Optional fast JSON encoder; output matches the compact json fallback
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Price inside product card text, e.g. "Coffee $4.50"
+_PRICE_RE: Final = re.compile(r'\$[\d.]+')
+
+
+def _json_literal(value: Any) -> str:
+    """Compact JSON text for embedding in generated JS (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(value).decode()
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+# Sentinel for an absent key (an explicit None value still counts as set)
+_MISSING: Final = object()
+
+# Accepted key names for each visual property, in priority order
+_FONT_SIZE_KEYS: Final = ("font_size", "font-size")
+_FONT_WEIGHT_KEYS: Final = ("font_weight", "fontWeight")
+_TEXT_COLOR_KEYS: Final = ("text_color", "color")
+_TEXT_ALIGN_KEYS: Final = ("text_align", "text_alignment", "textAlign")
+_COLOR_KEYS: Final = ("color",)
+_BG_COLOR_KEYS: Final = ("background_color", "backgroundColor")
+_SECTION_BG_COLOR_KEYS: Final = ("bg_color", "background_color", "backgroundColor")
+_BORDER_KEYS: Final = ("border",)
+_BORDER_COLOR_KEYS: Final = ("border_color", "borderColor")
+_THICKNESS_KEYS: Final = ("thickness",)
+
+
+def _get_visual_property(visual: dict, keys: Tuple[str, ...], default: Any = None) -> Any:
     """
     Safely extract visual property with multiple key name fallbacks.
     Handles variations like: text_align, textAlign, text_alignment
@@ -14,23 +51,46 @@ def _get_visual_property(visual: dict, *keys, default=None):
     if not visual:
         return default
     for key in keys:
-        if key in visual:
-            return visual[key]
+        value = visual.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
     return default
 
 
-def _generate_text_element(component: dict, tokens: dict) -> str:
-    """Generate flexible Text component with visual properties."""
-    text = component.get("text", "Text")
-    visual = component.get("visual", {})
-    
-    # Extract visual properties with fallbacks
-    font_size = _get_visual_property(visual, "font_size", "font-size", default="16px")
-    font_weight = _get_visual_property(visual, "font_weight", "fontWeight", default="normal")
-    text_color = _get_visual_property(visual, "text_color", "color", default="#1F2937")
-    text_align = _get_visual_property(visual, "text_align", "text_alignment", "textAlign", default="left")
-    
-    return f'''export default function Text({{ text = "{text}", fontSize = "{font_size}", fontWeight = "{font_weight}", textColor = "{text_color}", align = "{text_align}" }}) {{
+# Blueprint text lands in double-quoted JS strings (prop defaults, style
+# values) and in JSX children, each escaped for its context. In JS strings "<"
+# is written as \u003c so a value can't open or close a tag
+_JS_STR_TABLE: Final = str.maketrans({
+    '"': '\\"',
+    "\\": "\\\\",
+    "\n": "\\n",
+    "\r": "\\r",
+    "<": "\\u003c",
+})
+_JSX_TEXT_TABLE: Final = str.maketrans({
+    "&": "&amp;",
+    '"': "&quot;",
+    "<": "&lt;",
+    ">": "&gt;",
+    "{": "&#123;",
+    "}": "&#125;",
+})
+
+
+def _js_str(value: Any) -> str:
+    """str(value) escaped for a double-quoted JS string literal."""
+    return str(value).translate(_JS_STR_TABLE)
+
+
+def _jsx_text(value: Any) -> str:
+    """str(value) escaped for JSX text between tags."""
+    return str(value).translate(_JSX_TEXT_TABLE)
+
+
+# Component templates are plain str.format strings, parsed once at import:
+# {name} is a placeholder, {{ and }} are literal braces. Values are escaped
+# for their context before formatting.
+_TEXT_TMPL: Final = '''export default function Text({{ text = "{text}", fontSize = "{font_size}", fontWeight = "{font_weight}", textColor = "{text_color}", align = "{text_align}" }}) {{
   return (
     <div style={{{{fontSize, fontWeight, color: textColor, textAlign: align, padding: "8px 16px"}}}} >
       {{text}}
@@ -40,13 +100,34 @@ def _generate_text_element(component: dict, tokens: dict) -> str:
 '''
 
 
-def _generate_image(component: dict, tokens: dict) -> str:
-    """Generate Image component with styling."""
+def _text_props(component: dict) -> Tuple[Any, Any, Any, Any, Any]:
+    """Resolve (text, font_size, font_weight, text_color, text_align) for a text component."""
     visual = component.get("visual", {})
-    border = _get_visual_property(visual, "border", default="none")
-    bg_color = _get_visual_property(visual, "background_color", "backgroundColor", default="#EEEEEE")
     
-    return f'''export default function Image({{ src = "/placeholder.jpg", alt = "Image" }}) {{
+    # Extract visual properties with fallbacks
+    return (
+        component.get("text", "Text"),
+        _get_visual_property(visual, _FONT_SIZE_KEYS, default="16px"),
+        _get_visual_property(visual, _FONT_WEIGHT_KEYS, default="normal"),
+        _get_visual_property(visual, _TEXT_COLOR_KEYS, default="#1F2937"),
+        _get_visual_property(visual, _TEXT_ALIGN_KEYS, default="left"),
+    )
+
+
+def _generate_text_element(component: dict, primary: Optional[str], accent: Optional[str]) -> str:
+    """Generate flexible Text component with visual properties."""
+    text, font_size, font_weight, text_color, text_align = _text_props(component)
+    
+    return _TEXT_TMPL.format_map({
+        "text": _js_str(text),
+        "font_size": _js_str(font_size),
+        "font_weight": _js_str(font_weight),
+        "text_color": _js_str(text_color),
+        "text_align": _js_str(text_align),
+    })
+
+
+_IMAGE_TMPL: Final = '''export default function Image({{ src = "/placeholder.jpg", alt = "Image" }}) {{
   return (
     <img 
       src={{src}} 
@@ -59,16 +140,19 @@ def _generate_image(component: dict, tokens: dict) -> str:
 '''
 
 
-def _generate_header(component: dict, tokens: dict) -> str:
-    """Generate Header component."""
-    text = component.get("text", "Welcome")
+def _generate_image(component: dict, primary: Optional[str], accent: Optional[str]) -> str:
+    """Generate Image component with styling."""
     visual = component.get("visual", {})
-    bg_color = _get_visual_property(visual, "bg_color", "background_color", "backgroundColor", 
-                                    default=tokens.get("primary_color", "#FFFFFF"))
-    text_color = _get_visual_property(visual, "text_color", "color", 
-                                     default=tokens.get("accent_color", "#000000"))
+    border = _get_visual_property(visual, _BORDER_KEYS, default="none")
+    bg_color = _get_visual_property(visual, _BG_COLOR_KEYS, default="#EEEEEE")
     
-    return f'''export default function Header() {{
+    return _IMAGE_TMPL.format_map({
+        "border": _js_str(border),
+        "bg_color": _js_str(bg_color),
+    })
+
+
+_HEADER_TMPL: Final = '''export default function Header() {{
   return (
     <header className="px-4 py-6" style={{{{backgroundColor: "{bg_color}", color: "{text_color}"}}}} >
       <h1 className="text-2xl font-bold">{text}</h1>
@@ -78,13 +162,23 @@ def _generate_header(component: dict, tokens: dict) -> str:
 '''
 
 
-def _generate_divider(component: dict, tokens: dict) -> str:
-    """Generate Divider component."""
+def _generate_header(component: dict, primary: Optional[str], accent: Optional[str]) -> str:
+    """Generate Header component."""
+    text = component.get("text", "Welcome")
     visual = component.get("visual", {})
-    color = _get_visual_property(visual, "color", default=tokens.get("accent_color", "#000000"))
-    thickness = _get_visual_property(visual, "thickness", default="1px")
+    bg_color = _get_visual_property(visual, _SECTION_BG_COLOR_KEYS,
+                                    default=primary if primary is not None else "#FFFFFF")
+    text_color = _get_visual_property(visual, _TEXT_COLOR_KEYS,
+                                     default=accent if accent is not None else "#000000")
     
-    return f'''export default function Divider() {{
+    return _HEADER_TMPL.format_map({
+        "bg_color": _js_str(bg_color),
+        "text_color": _js_str(text_color),
+        "text": _jsx_text(text),
+    })
+
+
+_DIVIDER_TMPL: Final = '''export default function Divider() {{
   return (
     <div style={{{{height: "{thickness}", backgroundColor: "{color}", margin: "16px 0"}}}} />
   );
@@ -92,16 +186,19 @@ def _generate_divider(component: dict, tokens: dict) -> str:
 '''
 
 
-def _generate_cta_button(component: dict, tokens: dict) -> str:
-    """Generate CTA Button with correct colors."""
-    text = component.get("text", "Click Me")
+def _generate_divider(component: dict, primary: Optional[str], accent: Optional[str]) -> str:
+    """Generate Divider component."""
     visual = component.get("visual", {})
-    bg_color = _get_visual_property(visual, "background_color", "backgroundColor", 
-                                   default=tokens.get("primary_color", "#FFFFFF"))
-    text_color = _get_visual_property(visual, "text_color", "color", 
-                                     default=tokens.get("accent_color", "#000000"))
+    color = _get_visual_property(visual, _COLOR_KEYS, default=accent if accent is not None else "#000000")
+    thickness = _get_visual_property(visual, _THICKNESS_KEYS, default="1px")
     
-    return f'''export default function CTAButton({{ text = "{text}" }}) {{
+    return _DIVIDER_TMPL.format_map({
+        "thickness": _js_str(thickness),
+        "color": _js_str(color),
+    })
+
+
+_CTA_BUTTON_TMPL: Final = '''export default function CTAButton({{ text = "{text}" }}) {{
   return (
     <button className="w-full py-3 font-semibold rounded-lg hover:opacity-90 transition" style={{{{backgroundColor: "{bg_color}", color: "{text_color}"}}}} >
       {{text}}
@@ -111,13 +208,23 @@ def _generate_cta_button(component: dict, tokens: dict) -> str:
 '''
 
 
-def _generate_label(component: dict, tokens: dict) -> str:
-    """Generate Label component."""
-    text = component.get("text", "Label")
+def _generate_cta_button(component: dict, primary: Optional[str], accent: Optional[str]) -> str:
+    """Generate CTA Button with correct colors."""
+    text = component.get("text", "Click Me")
     visual = component.get("visual", {})
-    text_color = _get_visual_property(visual, "text_color", "color", default="#1F2937")
+    bg_color = _get_visual_property(visual, _BG_COLOR_KEYS,
+                                   default=primary if primary is not None else "#FFFFFF")
+    text_color = _get_visual_property(visual, _TEXT_COLOR_KEYS,
+                                     default=accent if accent is not None else "#000000")
     
-    return f'''export default function Label({{ text = "{text}" }}) {{
+    return _CTA_BUTTON_TMPL.format_map({
+        "text": _js_str(text),
+        "bg_color": _js_str(bg_color),
+        "text_color": _js_str(text_color),
+    })
+
+
+_LABEL_TMPL: Final = '''export default function Label({{ text = "{text}" }}) {{
   return (
     <label className="block text-sm font-medium" style={{{{color: "{text_color}"}}}} >
       {{text}}
@@ -127,14 +234,19 @@ def _generate_label(component: dict, tokens: dict) -> str:
 '''
 
 
-def _generate_text_input(component: dict, tokens: dict) -> str:
-    """Generate TextInput component."""
-    placeholder = component.get("text") or "Enter text"
+def _generate_label(component: dict, primary: Optional[str], accent: Optional[str]) -> str:
+    """Generate Label component."""
+    text = component.get("text", "Label")
     visual = component.get("visual", {})
-    border_color = _get_visual_property(visual, "border_color", "borderColor", 
-                                       default=tokens.get("primary_color", "#D1D5DB"))
+    text_color = _get_visual_property(visual, _TEXT_COLOR_KEYS, default="#1F2937")
     
-    return f'''export default function TextInput({{ placeholder = "{placeholder}", type = "text" }}) {{
+    return _LABEL_TMPL.format_map({
+        "text": _js_str(text),
+        "text_color": _js_str(text_color),
+    })
+
+
+_TEXT_INPUT_TMPL: Final = '''export default function TextInput({{ placeholder = "{placeholder}", type = "text" }}) {{
   return (
     <input
       type={{type}}
@@ -147,14 +259,20 @@ def _generate_text_input(component: dict, tokens: dict) -> str:
 '''
 
 
-def _generate_link(component: dict, tokens: dict) -> str:
-    """Generate Link component."""
-    text = component.get("text", "Link")
+def _generate_text_input(component: dict, primary: Optional[str], accent: Optional[str]) -> str:
+    """Generate TextInput component."""
+    placeholder = component.get("text") or "Enter text"
     visual = component.get("visual", {})
-    link_color = _get_visual_property(visual, "text_color", "color", 
-                                     default=tokens.get("primary_color", "#3B82F6"))
+    border_color = _get_visual_property(visual, _BORDER_COLOR_KEYS,
+                                       default=primary if primary is not None else "#D1D5DB")
     
-    return f'''export default function Link({{ text = "{text}", href = "#" }}) {{
+    return _TEXT_INPUT_TMPL.format_map({
+        "placeholder": _js_str(placeholder),
+        "border_color": _js_str(border_color),
+    })
+
+
+_LINK_TMPL: Final = '''export default function Link({{ text = "{text}", href = "#" }}) {{
   return (
     <a href={{href}} style={{{{color: "{link_color}", textDecoration: "none"}}}} >
       {{text}}
@@ -164,14 +282,20 @@ def _generate_link(component: dict, tokens: dict) -> str:
 '''
 
 
-def _generate_hero_section(component: dict, tokens: dict) -> str:
-    """Generate HeroSection component."""
-    text = component.get("text", "Welcome")
+def _generate_link(component: dict, primary: Optional[str], accent: Optional[str]) -> str:
+    """Generate Link component."""
+    text = component.get("text", "Link")
     visual = component.get("visual", {})
-    bg_color = _get_visual_property(visual, "bg_color", "background_color", "backgroundColor", 
-                                   default=tokens.get("primary_color", "#3B82F6"))
+    link_color = _get_visual_property(visual, _TEXT_COLOR_KEYS,
+                                     default=primary if primary is not None else "#3B82F6")
     
-    return f'''export default function HeroSection({{ text = "{text}", bgColor = "{bg_color}" }}) {{
+    return _LINK_TMPL.format_map({
+        "text": _js_str(text),
+        "link_color": _js_str(link_color),
+    })
+
+
+_HERO_SECTION_TMPL: Final = '''export default function HeroSection({{ text = "{text}", bgColor = "{bg_color}" }}) {{
   return (
     <section className="text-white px-4 py-12 text-center" style={{{{backgroundColor: bgColor}}}} >
       <h1 className="text-4xl font-bold">{{text}}</h1>
@@ -181,212 +305,332 @@ def _generate_hero_section(component: dict, tokens: dict) -> str:
 '''
 
 
+def _generate_hero_section(component: dict, primary: Optional[str], accent: Optional[str]) -> str:
+    """Generate HeroSection component."""
+    text = component.get("text", "Welcome")
+    visual = component.get("visual", {})
+    bg_color = _get_visual_property(visual, _SECTION_BG_COLOR_KEYS,
+                                   default=primary if primary is not None else "#3B82F6")
+    
+    return _HERO_SECTION_TMPL.format_map({
+        "text": _js_str(text),
+        "bg_color": _js_str(bg_color),
+    })
+
+
+# %-format template; every field is %s so values render as str() does (quoted
+# ones escaped first)
+_TOKENS_JS_TMPL: Final = '''// Design tokens
+export const tokens = {
+  baseSpacing: %s,
+  primaryColor: "%s",
+  accentColor: "%s",
+  fontScale: {
+    heading: %s,
+    body: %s,
+  },
+  borderRadius: "%s",
+};
+'''
+
+
 def _generate_tokens_js(blueprint: dict) -> str:
     """Generate tokens.js from blueprint tokens."""
     tokens = blueprint.get("tokens", {})
-    
-    base_spacing = tokens.get("base_spacing", 16)
-    primary_color = tokens.get("primary_color", "#FFFFFF")
-    accent_color = tokens.get("accent_color", "#000000")
-    border_radius = tokens.get("border_radius", "0px")
     font_scale = tokens.get("font_scale", {"heading": 1.5, "body": 1.0})
     
-    return f'''// Design tokens
-export const tokens = {{
-  baseSpacing: {base_spacing},
-  primaryColor: "{primary_color}",
-  accentColor: "{accent_color}",
-  fontScale: {{
-    heading: {font_scale.get("heading", 1.5)},
-    body: {font_scale.get("body", 1.0)},
-  }},
-  borderRadius: "{border_radius}",
-}};
+    return _TOKENS_JS_TMPL % (
+        tokens.get("base_spacing", 16),
+        _js_str(tokens.get("primary_color", "#FFFFFF")),
+        _js_str(tokens.get("accent_color", "#000000")),
+        font_scale.get("heading", 1.5),
+        font_scale.get("body", 1.0),
+        _js_str(tokens.get("border_radius", "0px")),
+    )
+
+
+# Static product components (no per-blueprint fields)
+_PRODUCT_CARD_JSX: Final = '''export default function ProductCard({ title, price, image }) {
+  return (
+    <div className="bg-white border border-gray-200 rounded-lg overflow-hidden">
+      <img
+        src={image}
+        alt={title}
+        className="w-full aspect-square object-cover"
+      />
+      <div className="p-4">
+        <h2 className="text-lg font-semibold text-gray-800">{title}</h2>
+        <p className="text-xl font-bold text-amber-600 mt-2">{price}</p>
+      </div>
+    </div>
+  );
+}
 '''
 
+_PRODUCT_GRID_JSX: Final = '''export default function ProductGrid({ products }) {
+  return (
+    <div className="grid grid-cols-2 gap-4 px-3 py-6">
+      {products.map((product) => (
+        <div key={product.id} className="bg-white border border-gray-200 rounded-lg overflow-hidden">
+          <img
+            src={product.image}
+            alt={product.title}
+            className="w-full aspect-square object-cover"
+          />
+          <div className="p-4">
+            <h2 className="text-lg font-semibold text-gray-800">{product.title}</h2>
+            <p className="text-xl font-bold text-amber-600 mt-2">{product.price}</p>
+          </div>
+        </div>
+      ))}
+    </div>
+  );
+}
+'''
 
-def generate_react_project(blueprint: dict) -> dict:
+
+def _product_entry(product_id: int, card: dict) -> dict:
+    """Grid data for one product card: title and price parsed from its text."""
+    text_content = card.get("text", "Product")
+    visual = card.get("visual", {})
+    
+    # Parse text for title/price
+    title = text_content
+    price = None
+    
+    # Try newline split
+    first_line, newline, rest = text_content.partition("\n")
+    if newline:
+        title = first_line.strip()
+        price = rest.strip()
+    else:
+        # Try regex for price pattern
+        price_match = _PRICE_RE.search(text_content)
+        if price_match:
+            price = price_match.group()
+            title = text_content.replace(price, "").strip()
+    
+    if not price:
+        price = f"${product_id*10 + 9}.99"
+    if not title:
+        title = "Product"
+    
+    return {
+        "id": product_id,
+        "title": title.strip(),
+        "price": price.strip(),
+        "image": visual.get("image_url", "/placeholder.jpg")
+    }
+
+
+# JSX attribute strings decode HTML entities (and nothing else), so markup
+# characters in values are written as entities
+_JSX_ATTR_TABLE: Final = str.maketrans({
+    "&": "&amp;",
+    '"': "&quot;",
+    "<": "&lt;",
+    ">": "&gt;",
+})
+
+
+def _jsx_attr(value: str) -> str:
+    """Escape a value for use inside a double-quoted JSX attribute."""
+    return value.translate(_JSX_ATTR_TABLE)
+
+
+# Renderers for one component instance in the App.jsx body. The JSX strings
+# are memoized on str() of each value (what the f-string would format), so
+# repeated identical components cost one cache hit.
+@lru_cache(maxsize=512)
+def _text_jsx(text: str, font_size: str, font_weight: str, text_color: str, text_align: str) -> str:
+    return (
+        f'<Text text="{_jsx_attr(text)}" fontSize="{_jsx_attr(font_size)}" '
+        f'fontWeight="{_jsx_attr(font_weight)}" textColor="{_jsx_attr(text_color)}" '
+        f'align="{_jsx_attr(text_align)}" />'
+    )
+
+
+@lru_cache(maxsize=512)
+def _text_attr_jsx(tag: str, attr: str, value: str, extra: str = "") -> str:
+    return f'<{tag} {attr}="{_jsx_attr(value)}"{extra} />'
+
+
+def _render_header(component: dict) -> str:
+    return "<Header />"
+
+
+def _render_text(component: dict) -> str:
+    return _text_jsx(*map(str, _text_props(component)))
+
+
+def _render_image(component: dict) -> str:
+    return "<Image />"
+
+
+def _render_divider(component: dict) -> str:
+    return "<Divider />"
+
+
+def _render_cta_button(component: dict) -> str:
+    return _text_attr_jsx("CTAButton", "text", str(component.get("text", "Click Me")))
+
+
+def _render_label(component: dict) -> str:
+    return _text_attr_jsx("Label", "text", str(component.get("text", "Label")))
+
+
+def _render_text_input(component: dict) -> str:
+    return _text_attr_jsx("TextInput", "placeholder", str(component.get("text") or "Enter text"))
+
+
+def _render_link(component: dict) -> str:
+    return _text_attr_jsx("Link", "text", str(component.get("text", "Link")), ' href="#"')
+
+
+def _render_hero_section(component: dict) -> str:
+    return _text_attr_jsx("HeroSection", "text", str(component.get("text", "Welcome")))
+
+
+# Component file generator (component, primary color, accent color) and
+# instance renderer (component)
+_Generator = Callable[[dict, Optional[str], Optional[str]], str]
+_Renderer = Callable[[dict], str]
+_ComponentKind = Tuple[str, int, str, _Generator, _Renderer, Optional[str]]
+
+# One bit per generated component file, for tracking what has been emitted
+_COMPONENT_BITS: Final = {
+    name: 1 << bit for bit, name in enumerate((
+        "Header", "Text", "Image", "Divider", "CTAButton", "Label",
+        "TextInput", "Link", "HeroSection", "ProductCard", "ProductGrid",
+    ))
+}
+_PRODUCT_CARD_BIT: Final = _COMPONENT_BITS["ProductCard"]
+_PRODUCT_GRID_BIT: Final = _COMPONENT_BITS["ProductGrid"]
+
+
+def _component_kind(
+    name: str,
+    generate: _Generator,
+    render: _Renderer,
+    role: Optional[str] = None
+) -> _ComponentKind:
+    """Dispatch entry: (file name, bit, import line, generator, renderer, required role)."""
+    import_line = f'import {name} from "./components/{name}";'
+    return (name, _COMPONENT_BITS[name], import_line, generate, render, role)
+
+
+# Blueprint component type -> how to emit it (product cards are handled separately)
+_COMPONENT_KINDS: Final[Dict[str, _ComponentKind]] = {
+    "header": _component_kind("Header", _generate_header, _render_header),
+    "text": _component_kind("Text", _generate_text_element, _render_text),
+    "image": _component_kind("Image", _generate_image, _render_image),
+    "divider": _component_kind("Divider", _generate_divider, _render_divider),
+    "button": _component_kind("CTAButton", _generate_cta_button, _render_cta_button, role="cta"),
+    "label": _component_kind("Label", _generate_label, _render_label),
+    "text_input": _component_kind("TextInput", _generate_text_input, _render_text_input),
+    "input": _component_kind("TextInput", _generate_text_input, _render_text_input),
+    "link": _component_kind("Link", _generate_link, _render_link),
+    "hero_section": _component_kind("HeroSection", _generate_hero_section, _render_hero_section),
+    "hero": _component_kind("HeroSection", _generate_hero_section, _render_hero_section),
+}
+
+
+# App.jsx without a product grid, split around the import and render sections
+_APP_PREFIX: Final = 'import { tokens } from "./tokens";\n'
+_APP_MIDDLE: Final = (
+    '\n\nexport default function App() {\n'
+    '  return (\n'
+    '    <div className="min-h-screen bg-white">\n'
+    '      '
+)
+_APP_SUFFIX: Final = '\n    </div>\n  );\n}\n'
+
+
+def generate_react_project(
+    blueprint: dict,
+    sink: Optional[Callable[[str, str], None]] = None
+) -> dict:
     """
     Generate complete React project from blueprint.
     Properly handles all component types and visual properties.
+    
+    Args:
+        blueprint: Design blueprint
+        sink: Optional callback(path, content) receiving each file as it is
+            generated (e.g. to write it to disk); the returned "files" is
+            then empty
     """
     tokens = blueprint.get("tokens", {})
-    files = {}
-    imports = []
-    component_renders = []
-    generated_components = set()
-    product_grid_data = []
-    has_product_grid = False
+    # Theme colors used as generator defaults (None when the token is unset)
+    primary = tokens.get("primary_color")
+    accent = tokens.get("accent_color")
+    files: Dict[str, str] = {}
+    emit = files.__setitem__ if sink is None else sink
+    imports: List[str] = []
+    generated = 0  # _COMPONENT_BITS of the component files emitted so far
     
     # Generate tokens
-    files["tokens.js"] = _generate_tokens_js(blueprint)
+    emit("tokens.js", _generate_tokens_js(blueprint))
     # Don't add to imports here - it will be added to the template directly
     
-    # Analyze blueprint
     components = blueprint.get("components", [])
-    component_count = {}
-    for comp in components:
-        comp_type = comp.get("type", "unknown")
-        component_count[comp_type] = component_count.get(comp_type, 0) + 1
     
-    # FIRST PASS: Generate all unique component files
+    # Component types as one flat list, read by every scan below. Names are
+    # interned so matching them against the dispatch-table keys (interned
+    # literals) short-circuits on identity
+    types = []
     for comp in components:
         comp_type = comp.get("type", "unknown")
+        types.append(sys.intern(comp_type) if type(comp_type) is str else comp_type)
+    
+    # Multiple product cards render as one data-driven grid
+    has_product_grid = types.count("product_card") > 1
+    product_grid_data = [
+        _product_entry(n, card)
+        for n, card in enumerate(
+            (comp for comp, comp_type in zip(components, types) if comp_type == "product_card"), 1
+        )
+    ] if has_product_grid else []
+    
+    # Single pass: emit each component file on first use, render in blueprint order
+    # (one slot per component; slots left None render nothing)
+    renders: List[Optional[str]] = [None] * len(components)
+    for i, comp_type in enumerate(types):
+        comp = components[i]
         
-        if comp_type == "header":
-            if "Header" not in generated_components:
-                files["src/components/Header.jsx"] = _generate_header(comp, tokens)
-                imports.append('import Header from "./components/Header";')
-                generated_components.add("Header")
-        
-        elif comp_type == "text":
-            if "Text" not in generated_components:
-                files["src/components/Text.jsx"] = _generate_text_element(comp, tokens)
-                imports.append('import Text from "./components/Text";')
-                generated_components.add("Text")
-        
-        elif comp_type == "image":
-            if "Image" not in generated_components:
-                files["src/components/Image.jsx"] = _generate_image(comp, tokens)
-                imports.append('import Image from "./components/Image";')
-                generated_components.add("Image")
-        
-        elif comp_type == "divider":
-            if "Divider" not in generated_components:
-                files["src/components/Divider.jsx"] = _generate_divider(comp, tokens)
-                imports.append('import Divider from "./components/Divider";')
-                generated_components.add("Divider")
-        
-        elif comp_type == "button" and comp.get("role") == "cta":
-            if "CTAButton" not in generated_components:
-                files["src/components/CTAButton.jsx"] = _generate_cta_button(comp, tokens)
-                imports.append('import CTAButton from "./components/CTAButton";')
-                generated_components.add("CTAButton")
-        
-        elif comp_type == "product_card":
-            if "ProductCard" not in generated_components:
-                files["src/components/ProductCard.jsx"] = _product_card_component()
-                generated_components.add("ProductCard")
+        if comp_type == "product_card":
+            if not generated & _PRODUCT_CARD_BIT:
+                emit("src/components/ProductCard.jsx", _PRODUCT_CARD_JSX)
+                generated |= _PRODUCT_CARD_BIT
             
-            # Handle multiple product cards
-            if component_count.get("product_card", 0) > 1 and "ProductGrid" not in generated_components:
-                files["src/components/ProductGrid.jsx"] = _product_grid_component()
+            # The grid renders once, at the first card's position
+            if has_product_grid and not generated & _PRODUCT_GRID_BIT:
+                emit("src/components/ProductGrid.jsx", _PRODUCT_GRID_JSX)
                 imports.append('import ProductGrid from "./components/ProductGrid";')
-                generated_components.add("ProductGrid")
-                has_product_grid = True
-                
-                # Extract product data
-                for i, pc in enumerate([c for c in components if c.get("type") == "product_card"]):
-                    text_content = pc.get("text", "Product")
-                    visual = pc.get("visual", {})
-                    
-                    # Parse text for title/price
-                    title = text_content
-                    price = None
-                    
-                    # Try newline split
-                    if "\n" in text_content:
-                        parts = text_content.split("\n", 1)
-                        title = parts[0].strip()
-                        price = parts[1].strip()
-                    else:
-                        # Try regex for price pattern
-                        price_match = re.search(r'\$[\d.]+', text_content)
-                        if price_match:
-                            price = price_match.group()
-                            title = text_content.replace(price, "").strip()
-                    
-                    if not price:
-                        price = f"${(i+1)*10 + 9}.99"
-                    if not title:
-                        title = "Product"
-                    
-                    product_grid_data.append({
-                        "id": i + 1,
-                        "title": title.strip(),
-                        "price": price.strip(),
-                        "image": visual.get("image_url", "/placeholder.jpg")
-                    })
-        
-        elif comp_type == "label":
-            if "Label" not in generated_components:
-                files["src/components/Label.jsx"] = _generate_label(comp, tokens)
-                imports.append('import Label from "./components/Label";')
-                generated_components.add("Label")
-        
-        elif comp_type == "text_input" or comp_type == "input":
-            if "TextInput" not in generated_components:
-                files["src/components/TextInput.jsx"] = _generate_text_input(comp, tokens)
-                imports.append('import TextInput from "./components/TextInput";')
-                generated_components.add("TextInput")
-        
-        elif comp_type == "link":
-            if "Link" not in generated_components:
-                files["src/components/Link.jsx"] = _generate_link(comp, tokens)
-                imports.append('import Link from "./components/Link";')
-                generated_components.add("Link")
-        
-        elif comp_type == "hero_section" or comp_type == "hero":
-            if "HeroSection" not in generated_components:
-                files["src/components/HeroSection.jsx"] = _generate_hero_section(comp, tokens)
-                imports.append('import HeroSection from "./components/HeroSection";')
-                generated_components.add("HeroSection")
-    
-    # SECOND PASS: Render components in blueprint order
-    product_card_rendered = False
-    for comp in components:
-        comp_type = comp.get("type", "unknown")
-        comp_role = comp.get("role", "content")
-        
-        if comp_type == "header":
-            component_renders.append("<Header />")
-        
-        elif comp_type == "divider":
-            component_renders.append("<Divider />")
-        
-        elif comp_type == "text":
-            text_content = comp.get("text", "Text")
-            visual = comp.get("visual", {})
-            font_size = _get_visual_property(visual, "font_size", "font-size", default="16px")
-            font_weight = _get_visual_property(visual, "font_weight", "fontWeight", default="normal")
-            text_color = _get_visual_property(visual, "text_color", "color", default="#1F2937")
-            text_align = _get_visual_property(visual, "text_align", "text_alignment", "textAlign", default="left")
-            component_renders.append(f'<Text text="{text_content}" fontSize="{font_size}" fontWeight="{font_weight}" textColor="{text_color}" align="{text_align}" />')
-        
-        elif comp_type == "image":
-            component_renders.append('<Image />')
-        
-        elif comp_type == "product_card":
-            if not product_card_rendered and has_product_grid:
-                component_renders.append("<ProductGrid products={products} />")
-                product_card_rendered = True
-        
-        elif comp_type == "button" and comp_role == "cta":
-            button_text = comp.get("text", "Click Me")
-            component_renders.append(f'<CTAButton text="{button_text}" />')
-        
-        elif comp_type == "label":
-            label_text = comp.get("text", "Label")
-            component_renders.append(f'<Label text="{label_text}" />')
+                generated |= _PRODUCT_GRID_BIT
+                renders[i] = "<ProductGrid products={products} />"
+            continue
         
-        elif comp_type == "text_input" or comp_type == "input":
-            placeholder = comp.get("text") or "Enter text"
-            component_renders.append(f'<TextInput placeholder="{placeholder}" />')
+        kind = _COMPONENT_KINDS.get(comp_type)
+        if kind is None:
+            continue
+        name, bit, import_line, generate, render, role = kind
+        if role is not None and comp.get("role") != role:
+            continue
         
-        elif comp_type == "link":
-            link_text = comp.get("text", "Link")
-            component_renders.append(f'<Link text="{link_text}" href="#" />')
-        
-        elif comp_type == "hero_section" or comp_type == "hero":
-            hero_text = comp.get("text", "Welcome")
-            component_renders.append(f'<HeroSection text="{hero_text}" />')
+        if not generated & bit:
+            emit(f"src/components/{name}.jsx", generate(comp, primary, accent))
+            imports.append(import_line)
+            generated |= bit
+        renders[i] = render(comp)
     
     # Generate App.jsx
+    component_renders = [r for r in renders if r]
     import_section = "\n".join(imports) if imports else "// No imports"
     render_items = "\n      ".join(component_renders) if component_renders else "<div>No components</div>"
     
     if has_product_grid:
-        products_json = json.dumps(product_grid_data)
+        products_json = _json_literal(product_grid_data)
         app_jsx = f'''import {{ tokens }} from "./tokens";
 {import_section}
 
@@ -401,65 +645,11 @@ export default function App() {{
 }}
 '''
     else:
-        app_jsx = f'''import {{ tokens }} from "./tokens";
-{import_section}
-
-export default function App() {{
-  return (
-    <div className="min-h-screen bg-white">
-      {render_items}
-    </div>
-  );
-}}
-'''
+        app_jsx = _APP_PREFIX + import_section + _APP_MIDDLE + render_items + _APP_SUFFIX
     
-    files["src/App.jsx"] = app_jsx
+    emit("src/App.jsx", app_jsx)
     
     return {
         "files": files,
         "entry": "src/App.jsx"
     }
-
-
-def _product_card_component() -> str:
-    """Product card component."""
-    return '''export default function ProductCard({ title, price, image }) {
-  return (
-    <div className="bg-white border border-gray-200 rounded-lg overflow-hidden">
-      <img
-        src={image}
-        alt={title}
-        className="w-full aspect-square object-cover"
-      />
-      <div className="p-4">
-        <h2 className="text-lg font-semibold text-gray-800">{title}</h2>
-        <p className="text-xl font-bold text-amber-600 mt-2">{price}</p>
-      </div>
-    </div>
-  );
-}
-'''
-
-
-def _product_grid_component() -> str:
-    """Product grid component."""
-    return '''export default function ProductGrid({ products }) {
-  return (
-    <div className="grid grid-cols-2 gap-4 px-3 py-6">
-      {products.map((product) => (
-        <div key={product.id} className="bg-white border border-gray-200 rounded-lg overflow-hidden">
-          <img
-            src={product.image}
-            alt={product.title}
-            className="w-full aspect-square object-cover"
-          />
-          <div className="p-4">
-            <h2 className="text-lg font-semibold text-gray-800">{product.title}</h2>
-            <p className="text-xl font-bold text-amber-600 mt-2">{product.price}</p>
-          </div>
-        </div>
-      ))}
-    </div>
-  );
-}
-'''
@@ -1,42 +1,116 @@
+import io
+import json
+import re
+import tarfile
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import accumulate
+from typing import BinaryIO, Callable, Dict, List, Optional, Tuple
+
+
+# Shared stand-in for a missing/null "visual" (read-only, never mutated)
+_EMPTY: dict = {}
+
+# Price inside product card text, e.g. "Coffee $4.50"
+_PRICE_RE = re.compile(r'\$[\d.]+')
+
+# Escapes for generated source: _js for values inside double-quoted JS string
+# literals, _jsx for JSX text and double-quoted JSX attributes (as entities)
+_JS_STR_ESCAPE = str.maketrans({
+    '"': '\\"',
+    "\\": "\\\\",
+    "\n": "\\n",
+    "\r": "\\r",
+    "<": "\\u003c",
+})
+_JSX_TEXT_ESCAPE = str.maketrans({
+    "&": "&amp;",
+    '"': "&quot;",
+    "<": "&lt;",
+    ">": "&gt;",
+    "{": "&#123;",
+    "}": "&#125;",
+})
+# Hex colors need no escaping in either context
+_HEX_COLOR_RE = re.compile(r"#[0-9A-Fa-f]{3,8}")
+
+
+def _js(value) -> str:
+    """str(value) escaped for a double-quoted JS string literal."""
+    text = str(value)
+    if _HEX_COLOR_RE.fullmatch(text):
+        return text
+    return text.translate(_JS_STR_ESCAPE)
+
+
+def _jsx(value) -> str:
+    """str(value) escaped for JSX text or a double-quoted JSX attribute."""
+    text = str(value)
+    if _HEX_COLOR_RE.fullmatch(text):
+        return text
+    return text.translate(_JSX_TEXT_ESCAPE)
+
+
 def _analyze_blueprint(blueprint: dict) -> dict:
     """Analyze blueprint structure to determine component types needed."""
     components = blueprint.get("components", [])
-    analysis = {
-        "component_types": {},
-        "component_list": [],
-        "component_count": {}
+    return {
+        "component_count": Counter(comp.get("type", "unknown") for comp in components),
+        "component_list": [
+            {
+                "id": comp.get("id", f"comp_{i}"),
+                "type": comp.get("type", "unknown"),
+                "role": comp.get("role", "content"),
+                "index": i,
+                "data": comp
+            }
+            for i, comp in enumerate(components)
+        ],
     }
+
+
+@dataclass(slots=True, frozen=True)
+class _TokenView:
+    """
+    Blueprint tokens, read once per project.
     
-    for i, comp in enumerate(components):
-        comp_type = comp.get("type", "unknown")
-        comp_role = comp.get("role", "content")
-        comp_id = comp.get("id", f"comp_{i}")
-        
-        if comp_type not in analysis["component_types"]:
-            analysis["component_types"][comp_type] = []
-            analysis["component_count"][comp_type] = 0
-        
-        analysis["component_types"][comp_type].append(comp)
-        analysis["component_count"][comp_type] += 1
-        analysis["component_list"].append({
-            "id": comp_id,
-            "type": comp_type,
-            "role": comp_role,
-            "index": i,
-            "data": comp
-        })
+    Theme colors are None when unset, since each generator has its own
+    fallback; the other tokens carry their tokens.js defaults.
+    """
+    primary_color: Optional[str] = None
+    accent_color: Optional[str] = None
+    base_spacing: object = 16
+    border_radius: object = "8px"
     
-    return analysis
+    @classmethod
+    def from_tokens(cls, tokens: dict) -> "_TokenView":
+        return cls(
+            primary_color=tokens.get("primary_color"),
+            accent_color=tokens.get("accent_color"),
+            base_spacing=tokens.get("base_spacing", 16),
+            border_radius=tokens.get("border_radius", "8px"),
+        )
 
 
-def _generate_header(component: dict, tokens: dict) -> str:
-    """Generate Header.jsx from header component."""
-    text = component.get("text", "Welcome")
-    visual = component.get("visual", {})
-    bg_color = visual.get("bg_color", tokens.get("primary_color", "#3B82F6"))
-    text_color = visual.get("text_color", tokens.get("accent_color", "#FFFFFF"))
+@lru_cache(maxsize=256)
+def _render_template(template: str, fields: Tuple[Tuple[str, str], ...]) -> str:
+    return template.format_map(dict(fields))
+
+
+def _fill(template: str, **fields) -> str:
+    """
+    Fill a component template.
     
-    return f'''export default function Header() {{
+    Memoized on str() of each field (exactly what format_map would print),
+    so regenerating the same component costs one cache hit.
+    """
+    return _render_template(template, tuple((name, str(value)) for name, value in fields.items()))
+
+
+# Component templates are plain str.format strings, parsed once at import:
+# {name} is a placeholder, {{ and }} are literal braces.
+_HEADER_TMPL = '''export default function Header() {{
   return (
     <header className="px-4 py-6" style={{{{backgroundColor: "{bg_color}", color: "{text_color}"}}}} >
       <h1 className="text-2xl font-bold">{text}</h1>
@@ -46,9 +120,17 @@ def _generate_header(component: dict, tokens: dict) -> str:
 '''
 
 
-def _generate_product_card(component: dict, tokens: dict, include_data: bool = False) -> str:
-    """Generate ProductCard.jsx component."""
-    return '''export default function ProductCard({ title, price, image }) {
+def _generate_header(component: dict, tokens: _TokenView) -> str:
+    """Generate Header.jsx from header component."""
+    text = component.get("text", "Welcome")
+    visual = component.get("visual") or _EMPTY
+    bg_color = visual.get("bg_color", tokens.primary_color if tokens.primary_color is not None else "#3B82F6")
+    text_color = visual.get("text_color", tokens.accent_color if tokens.accent_color is not None else "#FFFFFF")
+    
+    return _fill(_HEADER_TMPL, bg_color=_js(bg_color), text_color=_js(text_color), text=_jsx(text))
+
+
+_PRODUCT_CARD_JSX = '''export default function ProductCard({ title, price, image }) {
   return (
     <div className="bg-white border border-gray-200 rounded-lg overflow-hidden">
       <img
@@ -66,13 +148,12 @@ def _generate_product_card(component: dict, tokens: dict, include_data: bool = F
 '''
 
 
-def _generate_divider(component: dict, tokens: dict) -> str:
-    """Generate Divider.jsx component."""
-    visual = component.get("visual", {})
-    color = visual.get("color", tokens.get("accent_color", "#000000"))
-    thickness = visual.get("thickness", "1px")
-    
-    return f'''export default function Divider() {{
+def _generate_product_card(component: dict, tokens: _TokenView, include_data: bool = False) -> str:
+    """Generate ProductCard.jsx component."""
+    return _PRODUCT_CARD_JSX
+
+
+_DIVIDER_TMPL = '''export default function Divider() {{
   return (
     <div style={{{{height: "{thickness}", backgroundColor: "{color}", margin: "16px 0"}}}} />
   );
@@ -80,9 +161,16 @@ def _generate_divider(component: dict, tokens: dict) -> str:
 '''
 
 
-def _generate_product_grid(components: list, tokens: dict) -> str:
-    """Generate ProductGrid.jsx for multiple product cards in 2-column grid."""
-    return '''export default function ProductGrid({ products }) {
+def _generate_divider(component: dict, tokens: _TokenView) -> str:
+    """Generate Divider.jsx component."""
+    visual = component.get("visual") or _EMPTY
+    color = visual.get("color", tokens.accent_color if tokens.accent_color is not None else "#000000")
+    thickness = visual.get("thickness", "1px")
+    
+    return _fill(_DIVIDER_TMPL, thickness=_js(thickness), color=_js(color))
+
+
+_PRODUCT_GRID_JSX = '''export default function ProductGrid({ products }) {
   return (
     <div className="grid grid-cols-2 gap-4 px-3 py-6">
       {products.map((product) => (
@@ -104,15 +192,12 @@ def _generate_product_grid(components: list, tokens: dict) -> str:
 '''
 
 
-def _generate_cta_button(component: dict, tokens: dict) -> str:
-    """Generate CTA button component."""
-    text = component.get("text", "Click Me")
-    visual = component.get("visual", {})
-    # Get button colors from visual properties
-    bg_color = visual.get("background_color", tokens.get("primary_color", "#FFFFFF"))
-    text_color = visual.get("text_color", tokens.get("accent_color", "#000000"))
-    
-    return f'''export default function CTAButton({{ text = "{text}" }}) {{
+def _generate_product_grid(components: list, tokens: _TokenView) -> str:
+    """Generate ProductGrid.jsx for multiple product cards in 2-column grid."""
+    return _PRODUCT_GRID_JSX
+
+
+_CTA_BUTTON_TMPL = '''export default function CTAButton({{ text = "{text}" }}) {{
   return (
     <button className="w-full py-3 font-semibold rounded-lg hover:opacity-90 transition" style={{{{backgroundColor: "{bg_color}", color: "{text_color}"}}}} >
       {{text}}
@@ -122,13 +207,18 @@ def _generate_cta_button(component: dict, tokens: dict) -> str:
 '''
 
 
-def _generate_hero_section(component: dict, tokens: dict) -> str:
-    """Generate HeroSection.jsx component."""
-    text = component.get("text", "Welcome to Our Store")
-    visual = component.get("visual", {})
-    bg_color = visual.get("bg_color", tokens.get("primary_color", "#3B82F6"))
+def _generate_cta_button(component: dict, tokens: _TokenView) -> str:
+    """Generate CTA button component."""
+    text = component.get("text", "Click Me")
+    visual = component.get("visual") or _EMPTY
+    # Get button colors from visual properties
+    bg_color = visual.get("background_color", tokens.primary_color if tokens.primary_color is not None else "#FFFFFF")
+    text_color = visual.get("text_color", tokens.accent_color if tokens.accent_color is not None else "#000000")
     
-    return f'''export default function HeroSection({{ text = "{text}", bgColor = "{bg_color}" }}) {{
+    return _fill(_CTA_BUTTON_TMPL, text=_js(text), bg_color=_js(bg_color), text_color=_js(text_color))
+
+
+_HERO_SECTION_TMPL = '''export default function HeroSection({{ text = "{text}", bgColor = "{bg_color}" }}) {{
   return (
     <section className="text-white px-4 py-12 text-center" style={{{{backgroundColor: bgColor}}}} >
       <h1 className="text-4xl font-bold">{{text}}</h1>
@@ -138,11 +228,16 @@ def _generate_hero_section(component: dict, tokens: dict) -> str:
 '''
 
 
-def _generate_content_section(component: dict, tokens: dict) -> str:
-    """Generate ContentSection.jsx component."""
-    text = component.get("text", "Content goes here")
+def _generate_hero_section(component: dict, tokens: _TokenView) -> str:
+    """Generate HeroSection.jsx component."""
+    text = component.get("text", "Welcome to Our Store")
+    visual = component.get("visual") or _EMPTY
+    bg_color = visual.get("bg_color", tokens.primary_color if tokens.primary_color is not None else "#3B82F6")
     
-    return f'''export default function ContentSection({{ text = "{text}" }}) {{
+    return _fill(_HERO_SECTION_TMPL, text=_js(text), bg_color=_js(bg_color))
+
+
+_CONTENT_SECTION_TMPL = '''export default function ContentSection({{ text = "{text}" }}) {{
   return (
     <section className="px-4 py-6">
       <p className="text-gray-700 leading-relaxed">{{text}}</p>
@@ -152,13 +247,14 @@ def _generate_content_section(component: dict, tokens: dict) -> str:
 '''
 
 
-def _generate_footer(component: dict, tokens: dict) -> str:
-    """Generate Footer.jsx component."""
-    text = component.get("text", "Footer")
-    visual = component.get("visual", {})
-    bg_color = visual.get("bg_color", tokens.get("primary_color", "#3B82F6"))
+def _generate_content_section(component: dict, tokens: _TokenView) -> str:
+    """Generate ContentSection.jsx component."""
+    text = component.get("text", "Content goes here")
     
-    return f'''export default function Footer({{ text = "{text}", bgColor = "{bg_color}" }}) {{
+    return _fill(_CONTENT_SECTION_TMPL, text=_js(text))
+
+
+_FOOTER_TMPL = '''export default function Footer({{ text = "{text}", bgColor = "{bg_color}" }}) {{
   return (
     <footer className="px-4 py-6 text-center" style={{{{backgroundColor: bgColor, color: "white"}}}} >
       <p>{{text}}</p>
@@ -168,13 +264,16 @@ def _generate_footer(component: dict, tokens: dict) -> str:
 '''
 
 
-def _generate_text_section(component: dict, tokens: dict) -> str:
-    """Generate TextSection.jsx component."""
-    text = component.get("text", "This is a text section")
-    visual = component.get("visual", {})
-    text_color = visual.get("text_color", "#1F2937")
+def _generate_footer(component: dict, tokens: _TokenView) -> str:
+    """Generate Footer.jsx component."""
+    text = component.get("text", "Footer")
+    visual = component.get("visual") or _EMPTY
+    bg_color = visual.get("bg_color", tokens.primary_color if tokens.primary_color is not None else "#3B82F6")
     
-    return f'''export default function TextSection() {{
+    return _fill(_FOOTER_TMPL, text=_js(text), bg_color=_js(bg_color))
+
+
+_TEXT_SECTION_TMPL = '''export default function TextSection() {{
   return (
     <section className="px-4 py-6">
       <p className="text-gray-800 leading-relaxed text-base">{text}</p>
@@ -184,14 +283,16 @@ def _generate_text_section(component: dict, tokens: dict) -> str:
 '''
 
 
-def _generate_bullet_list(component: dict, tokens: dict) -> str:
-    """Generate BulletList.jsx component."""
-    text = component.get("text", "Item 1\nItem 2\nItem 3")
-    items = [item.strip() for item in text.split("\n") if item.strip()]
-    
-    items_jsx = "".join([f'        <li className="text-gray-700">{item}</li>\n' for item in items])
+def _generate_text_section(component: dict, tokens: _TokenView) -> str:
+    """Generate TextSection.jsx component."""
+    text = component.get("text", "This is a text section")
+    visual = component.get("visual") or _EMPTY
+    text_color = visual.get("text_color", "#1F2937")
     
-    return f'''export default function BulletList() {{
+    return _fill(_TEXT_SECTION_TMPL, text=_jsx(text))
+
+
+_BULLET_LIST_TMPL = '''export default function BulletList() {{
   return (
     <section className="px-4 py-6">
       <ul className="space-y-3">
@@ -202,65 +303,105 @@ def _generate_bullet_list(component: dict, tokens: dict) -> str:
 '''
 
 
-def _generate_feature_card(component: dict, tokens: dict) -> str:
+def _generate_bullet_list(component: dict, tokens: _TokenView) -> str:
+    """Generate BulletList.jsx component."""
+    return _bullet_list_source(component.get("text", "Item 1\nItem 2\nItem 3"))
+
+
+@lru_cache(maxsize=256)
+def _bullet_list_source(text: str) -> str:
+    items = filter(None, map(str.strip, text.split("\n")))
+    
+    items_jsx = "".join(f'        <li className="text-gray-700">{_jsx(item)}</li>\n' for item in items)
+    
+    return _BULLET_LIST_TMPL.format_map({"items_jsx": items_jsx})
+
+
+_FEATURE_CARD_TMPL = '''export default function FeatureCard({{ title, description }}) {{
+  return (
+    <div className="{bg_class} rounded-lg px-6 py-8">
+      <h3 className="text-lg font-semibold text-gray-800">{{title}}</h3>
+      <p className="text-gray-700 mt-2">{{description}}</p>
+    </div>
+  );
+}}
+'''
+
+
+def _generate_feature_card(component: dict, tokens: _TokenView) -> str:
     """Generate FeatureCard.jsx component."""
     text = component.get("text", "Feature")
-    visual = component.get("visual", {})
+    visual = component.get("visual") or _EMPTY
     bg_color = visual.get("bg_color", "#FEE2E2")
     text_color = visual.get("text_color", "#1F2937")
     
     bg_class = _hex_to_tailwind_bg(bg_color)
     
-    return f'''export default function FeatureCard({{ title, description }}) {{
+    return _fill(_FEATURE_CARD_TMPL, bg_class=bg_class)
+
+
+_FEATURE_CARDS_GRID_TMPL = '''export default function FeatureCardsGrid() {{
+  const features = [
+{features_jsx}  ];
+
   return (
-    <div className="{bg_class} rounded-lg px-6 py-8">
-      <h3 className="text-lg font-semibold text-gray-800">{{title}}</h3>
-      <p className="text-gray-700 mt-2">{{description}}</p>
-    </div>
+    <section className="px-3 py-6 space-y-4">
+      {{features.map((feature, idx) => (
+        <div key={{idx}} className="rounded-lg px-6 py-8" style={{{{backgroundColor: feature.bgColor, color: feature.textColor}}}} >
+          <h3 className="text-lg font-semibold">{{feature.title}}</h3>
+          <p className="mt-2">{{feature.description}}</p>
+        </div>
+      ))}}
+    </section>
   );
 }}
 '''
 
 
-def _generate_feature_cards_grid(components: list, tokens: dict) -> str:
+def _generate_feature_cards_grid(components: list, tokens: _TokenView) -> str:
     """Generate FeatureCardsGrid.jsx for multiple feature cards."""
     features = []
     for comp in components:
         if comp.get("type") == "feature_card":
-            visual = comp.get("visual", {})
+            visual = comp.get("visual") or _EMPTY
             features.append({
                 "title": comp.get("text", "Feature"),
                 "bg_color": visual.get("bg_color", "#FEE2E2"),
                 "text_color": visual.get("text_color", "#1F2937")
             })
     
-    features_jsx = "".join([
-        f'    {{ title: "{feat["title"]}", description: "Description for {feat["title"]}", bgColor: "{feat["bg_color"]}", textColor: "{feat["text_color"]}" }},\n' 
+    return _feature_cards_grid_source(tuple(
+        (_js(feat["title"]), _js(feat["bg_color"]), _js(feat["text_color"]))
         for feat in features[:3]
-    ])
+    ))
+
+
+# One features array entry of FeatureCardsGrid.jsx
+_FEAT_FMT = '    {{ title: "{0}", description: "Description for {0}", bgColor: "{1}", textColor: "{2}" }},\n'
+
+
+@lru_cache(maxsize=256)
+def _feature_cards_grid_source(features: Tuple[Tuple[str, str, str], ...]) -> str:
+    """FeatureCardsGrid.jsx for (title, bg_color, text_color) rows."""
+    features_jsx = "".join(_FEAT_FMT.format(*feature) for feature in features)
     
-    return f'''export default function FeatureCardsGrid() {{
-  const features = [
-{features_jsx}  ];
+    return _FEATURE_CARDS_GRID_TMPL.format_map({"features_jsx": features_jsx})
+
 
+_TEXT_TMPL = '''export default function Text({{ text = "{text}", fontSize = "{font_size}", fontWeight = "{font_weight}", textColor = "{text_color}", align = "{text_align}" }}) {{
   return (
-    <section className="px-3 py-6 space-y-4">
-      {{features.map((feature, idx) => (
-        <div key={{idx}} className="rounded-lg px-6 py-8" style={{{{backgroundColor: feature.bgColor, color: feature.textColor}}}} >
-          <h3 className="text-lg font-semibold">{{feature.title}}</h3>
-          <p className="mt-2">{{feature.description}}</p>
-        </div>
-      ))}}
-    </section>
+    <div style={{{{fontSize, fontWeight, color: textColor, textAlign: align, padding: "8px 16px"}}}} >
+      {{text}}
+    </div>
   );
 }}
 '''
 
 
-def _generate_text_element(component: dict, tokens: dict) -> str:
+def _generate_text_element(component: dict, tokens: _TokenView) -> str:
     """Generate Text.jsx component for plain text content with flexible styling."""
     text = component.get("text", "Text content")
-    visual = component.get("visual", {})
+    visual = component.get("visual") or _EMPTY
     role = component.get("role", "content")
     
     # Extract styling from visual properties with appropriate defaults
@@ -277,23 +418,17 @@ def _generate_text_element(component: dict, tokens: dict) -> str:
         if text_align == "left":
             text_align = "center"
     
-    return f'''export default function Text({{ text = "{text}", fontSize = "{font_size}", fontWeight = "{font_weight}", textColor = "{text_color}", align = "{text_align}" }}) {{
-  return (
-    <div style={{{{fontSize, fontWeight, color: textColor, textAlign: align, padding: "8px 16px"}}}} >
-      {{text}}
-    </div>
-  );
-}}
-'''
+    return _fill(
+        _TEXT_TMPL,
+        text=_js(text),
+        font_size=_js(font_size),
+        font_weight=_js(font_weight),
+        text_color=_js(text_color),
+        text_align=_js(text_align),
+    )
 
 
-def _generate_image(component: dict, tokens: dict) -> str:
-    """Generate Image.jsx component for displaying images."""
-    visual = component.get("visual", {})
-    border = visual.get("border", "none")
-    bg_color = visual.get("background_color", "#EEEEEE")
-    
-    return f'''export default function Image({{ src = "/placeholder.jpg", alt = "Image" }}) {{
+_IMAGE_TMPL = '''export default function Image({{ src = "/placeholder.jpg", alt = "Image" }}) {{
   return (
     <img 
       src={{src}} 
@@ -306,14 +441,16 @@ def _generate_image(component: dict, tokens: dict) -> str:
 '''
 
 
-def _generate_label(component: dict, tokens: dict) -> str:
-    """Generate Label.jsx component for form labels."""
-    text = component.get("text", "Label")
-    visual = component.get("visual", {})
-    # Use dark color for labels so they're readable
-    text_color = visual.get("text_color", "#1F2937")
+def _generate_image(component: dict, tokens: _TokenView) -> str:
+    """Generate Image.jsx component for displaying images."""
+    visual = component.get("visual") or _EMPTY
+    border = visual.get("border", "none")
+    bg_color = visual.get("background_color", "#EEEEEE")
     
-    return f'''export default function Label({{ text = "{text}" }}) {{
+    return _fill(_IMAGE_TMPL, border=_js(border), bg_color=_js(bg_color))
+
+
+_LABEL_TMPL = '''export default function Label({{ text = "{text}" }}) {{
   return (
     <label className="block text-sm font-medium" style={{{{color: "{text_color}"}}}} >
       {{text}}
@@ -323,13 +460,17 @@ def _generate_label(component: dict, tokens: dict) -> str:
 '''
 
 
-def _generate_text_input(component: dict, tokens: dict) -> str:
-    """Generate TextInput.jsx component for form inputs."""
-    placeholder = component.get("text") or "Enter text"
-    visual = component.get("visual", {})
-    border_color = visual.get("border_color", tokens.get("primary_color", "#D1D5DB"))
+def _generate_label(component: dict, tokens: _TokenView) -> str:
+    """Generate Label.jsx component for form labels."""
+    text = component.get("text", "Label")
+    visual = component.get("visual") or _EMPTY
+    # Use dark color for labels so they're readable
+    text_color = visual.get("text_color", "#1F2937")
     
-    return f'''export default function TextInput({{ placeholder = "{placeholder}", type = "text" }}) {{
+    return _fill(_LABEL_TMPL, text=_js(text), text_color=_js(text_color))
+
+
+_TEXT_INPUT_TMPL = '''export default function TextInput({{ placeholder = "{placeholder}", type = "text" }}) {{
   return (
     <input
       type={{type}}
@@ -342,13 +483,16 @@ def _generate_text_input(component: dict, tokens: dict) -> str:
 '''
 
 
-def _generate_link(component: dict, tokens: dict) -> str:
-    """Generate Link.jsx component for clickable links."""
-    text = component.get("text", "Link")
-    visual = component.get("visual", {})
-    link_color = visual.get("link_color", tokens.get("accent_color", "#0000FF"))
+def _generate_text_input(component: dict, tokens: _TokenView) -> str:
+    """Generate TextInput.jsx component for form inputs."""
+    placeholder = component.get("text") or "Enter text"
+    visual = component.get("visual") or _EMPTY
+    border_color = visual.get("border_color", tokens.primary_color if tokens.primary_color is not None else "#D1D5DB")
     
-    return f'''export default function Link({{ text = "{text}", href = "#" }}) {{
+    return _fill(_TEXT_INPUT_TMPL, placeholder=_js(placeholder), border_color=_js(border_color))
+
+
+_LINK_TMPL = '''export default function Link({{ text = "{text}", href = "#" }}) {{
   return (
     <a href={{href}} style={{{{color: "{link_color}", cursor: "pointer", textDecoration: "underline"}}}} >
       {{text}}
@@ -358,14 +502,16 @@ def _generate_link(component: dict, tokens: dict) -> str:
 '''
 
 
-def _generate_menu_item(component: dict, tokens: dict) -> str:
-    """Generate MenuItem.jsx component for menu items."""
-    text = component.get("text", "Menu Item")
-    visual = component.get("visual", {})
-    text_color = visual.get("text_color", "#1F2937")
-    font_size = visual.get("font_size", "16px")
+def _generate_link(component: dict, tokens: _TokenView) -> str:
+    """Generate Link.jsx component for clickable links."""
+    text = component.get("text", "Link")
+    visual = component.get("visual") or _EMPTY
+    link_color = visual.get("link_color", tokens.accent_color if tokens.accent_color is not None else "#0000FF")
     
-    return f'''export default function MenuItem({{ text = "{text}" }}) {{
+    return _fill(_LINK_TMPL, text=_js(text), link_color=_js(link_color))
+
+
+_MENU_ITEM_TMPL = '''export default function MenuItem({{ text = "{text}" }}) {{
   return (
     <div style={{{{fontSize: "{font_size}", color: "{text_color}", padding: "8px 16px"}}}} >
       {{text}}
@@ -375,15 +521,17 @@ def _generate_menu_item(component: dict, tokens: dict) -> str:
 '''
 
 
-def _generate_price(component: dict, tokens: dict) -> str:
-    """Generate Price.jsx component for menu prices."""
-    text = component.get("text", "Price")
-    visual = component.get("visual", {})
-    text_color = visual.get("text_color", tokens.get("accent_color", "#0000FF"))
-    font_size = visual.get("font_size", "14px")
-    font_weight = visual.get("font_weight", "bold")
+def _generate_menu_item(component: dict, tokens: _TokenView) -> str:
+    """Generate MenuItem.jsx component for menu items."""
+    text = component.get("text", "Menu Item")
+    visual = component.get("visual") or _EMPTY
+    text_color = visual.get("text_color", "#1F2937")
+    font_size = visual.get("font_size", "16px")
     
-    return f'''export default function Price({{ text = "{text}" }}) {{
+    return _fill(_MENU_ITEM_TMPL, text=_js(text), font_size=_js(font_size), text_color=_js(text_color))
+
+
+_PRICE_TMPL = '''export default function Price({{ text = "{text}" }}) {{
   return (
     <span style={{{{fontSize: "{font_size}", fontWeight: "{font_weight}", color: "{text_color}", padding: "8px 16px"}}}} >
       {{text}}
@@ -393,30 +541,38 @@ def _generate_price(component: dict, tokens: dict) -> str:
 '''
 
 
+def _generate_price(component: dict, tokens: _TokenView) -> str:
+    """Generate Price.jsx component for menu prices."""
+    text = component.get("text", "Price")
+    visual = component.get("visual") or _EMPTY
+    text_color = visual.get("text_color", tokens.accent_color if tokens.accent_color is not None else "#0000FF")
+    font_size = visual.get("font_size", "14px")
+    font_weight = visual.get("font_weight", "bold")
+    
+    return _fill(
+        _PRICE_TMPL,
+        text=_js(text),
+        font_size=_js(font_size),
+        font_weight=_js(font_weight),
+        text_color=_js(text_color),
+    )
+
+
 def _hex_to_tailwind_bg(hex_color: str) -> str:
     """Convert hex color to inline style with actual color."""
     if not hex_color:
         return 'style={{backgroundColor: "#3B82F6"}}'
-    return f'style={{backgroundColor: "{hex_color}"}}'
+    return f'style={{backgroundColor: "{_js(hex_color)}"}}'
 
 
 def _hex_to_tailwind_text(hex_color: str) -> str:
     """Convert hex color to inline style with actual color."""
     if not hex_color:
         return 'style={{color: "#FFFFFF"}}'
-    return f'style={{color: "{hex_color}"}}'
+    return f'style={{color: "{_js(hex_color)}"}}'
 
 
-def _generate_tokens_js(blueprint: dict) -> str:
-    """Generate tokens.js from blueprint tokens."""
-    tokens = blueprint.get("tokens", {})
-    base_spacing = tokens.get("base_spacing", 16)
-    primary_color = tokens.get("primary_color", "#3B82F6")
-    accent_color = tokens.get("accent_color", "#F59E0B")
-    border_radius = tokens.get("border_radius", "8px")
-    font_scale = tokens.get("font_scale", {})
-    
-    return f'''// Design tokens
+_TOKENS_JS_TMPL = '''// Design tokens
 export const tokens = {{
   baseSpacing: {base_spacing},
   primaryColor: "{primary_color}",
@@ -430,6 +586,329 @@ export const tokens = {{
 '''
 
 
+def _generate_tokens_js(tokens: _TokenView) -> str:
+    """Generate tokens.js from blueprint tokens."""
+    primary_color = tokens.primary_color if tokens.primary_color is not None else "#3B82F6"
+    accent_color = tokens.accent_color if tokens.accent_color is not None else "#F59E0B"
+    
+    return _fill(
+        _TOKENS_JS_TMPL,
+        base_spacing=tokens.base_spacing,
+        primary_color=_js(primary_color),
+        accent_color=_js(accent_color),
+        border_radius=_js(tokens.border_radius),
+    )
+
+
+@dataclass
+class _ProjectContext:
+    """Mutable state shared by the component handlers while generating one project."""
+    tokens: _TokenView
+    analysis: dict
+    components: List[dict]
+    # Generated files by path; also the record of what was emitted (content is
+    # None for files handed to sink instead)
+    files: Dict[str, Optional[str]] = field(default_factory=dict)
+    imports: List[str] = field(default_factory=list)
+    # Lines of App.jsx, newline-terminated (renders also carry their indentation)
+    component_renders: List[str] = field(default_factory=list)  # In blueprint order
+    product_grid_data: List[dict] = field(default_factory=list)  # Products for grid rendering
+    has_product_grid: bool = False
+    product_card_count: int = 0
+    feature_card_count: int = 0
+    # Receives each (path, content) as it is generated instead of files
+    sink: Optional[Callable[[str, str], None]] = None
+    
+    def emit(self, path: str, content: str) -> None:
+        if self.sink is None:
+            self.files[path] = content
+        else:
+            self.sink(path, content)
+            self.files[path] = None
+    
+    def emit_component(self, name: str, generate: Callable, *args, imported: bool = True) -> None:
+        """Generate src/components/<name>.jsx (and its import) unless already generated."""
+        path = f"src/components/{name}.jsx"
+        if path in self.files:
+            return
+        self.emit(path, generate(*args))
+        if imported:
+            self.imports.append(f'import {name} from "./components/{name}";\n')
+
+
+_Handler = Callable[[_ProjectContext, dict], None]
+
+
+# "Once" handlers -> their instance renderer. After such a handler has fired, its
+# component file exists, so later instances only need their render line; handlers
+# not listed (product_card, feature_card, button) depend on multiplicity or role
+# and run for every instance
+_REPEAT_RENDERS: Dict[_Handler, Callable[[dict], str]] = {}
+
+
+def _component_handler(name: str, generate: Callable, render: Optional[Callable] = None) -> _Handler:
+    """Handler that emits one component file and renders each instance (default <Name />)."""
+    tag = f"      <{name} />\n"
+    render_instance = render or (lambda comp_data: tag)
+    
+    def handle(ctx: _ProjectContext, comp_info: dict) -> None:
+        comp_data = comp_info["data"]
+        ctx.emit_component(name, generate, comp_data, ctx.tokens)
+        ctx.component_renders.append(render_instance(comp_data))
+    
+    _REPEAT_RENDERS[handle] = render_instance
+    return handle
+
+
+# Joins product texts for a single regex scan (texts containing it are scanned singly)
+_BATCH_SEP = "\0"
+
+
+def _first_prices(texts: List[str]) -> List[Optional[str]]:
+    """First _PRICE_RE match in each text, found with one regex scan over all of them."""
+    prices: List[Optional[str]] = [None] * len(texts)
+    if not texts:
+        return prices
+    
+    joined = _BATCH_SEP.join(texts)
+    if joined.count(_BATCH_SEP) != len(texts) - 1:
+        # A text contains the separator itself: match per text
+        for i, text in enumerate(texts):
+            price_match = _PRICE_RE.search(text)
+            prices[i] = price_match.group() if price_match else None
+        return prices
+    
+    # ends[i] is the offset just past text i's separator; matches never span one
+    ends = list(accumulate(len(text) + 1 for text in texts))
+    idx = 0
+    for price_match in _PRICE_RE.finditer(joined):
+        start = price_match.start()
+        while ends[idx] <= start:
+            idx += 1
+        if prices[idx] is None:
+            prices[idx] = price_match.group()
+    return prices
+
+
+def _product_grid_rows(product_cards: List[dict]) -> List[dict]:
+    """Grid data (id, title, price, image) parsed from each product card's text."""
+    texts = [pc.get("text", "Product") for pc in product_cards]
+    
+    # Price pattern ($ followed by digits) for every single-line text in one pass
+    single_line = [i for i, text in enumerate(texts) if "\n" not in text]
+    found_prices = dict(zip(single_line, _first_prices([texts[i] for i in single_line])))
+    
+    rows = []
+    rows_append = rows.append
+    for i, pc in enumerate(product_cards):
+        visual = pc.get("visual") or _EMPTY
+        text_content = texts[i]
+        
+        # Parse text field - try multiple formats:
+        # 1. "Title\nPrice" (newline separated)
+        # 2. "Title Price" (space separated with price starting with $)
+        # 3. "Title" (just title, use fallback price)
+        
+        title = text_content
+        price = None
+        
+        # Try newline split first
+        if i not in found_prices:
+            parts = text_content.split("\n", 1)
+            title = parts[0].strip()
+            price = parts[1].strip()
+        else:
+            price = found_prices[i]
+            if price:
+                # Remove price from text to get title
+                title = text_content.replace(price, "").strip()
+        
+        # Fallback if no price found
+        if not price:
+            price = visual.get("price")
+            if price is None:
+                price = f"${(i+1)*10 + 9}.99"
+        
+        # Ensure title is not empty
+        if not title or title == "$":
+            title = "Product"
+        
+        rows_append({
+            "id": i + 1,
+            "title": title.strip(),
+            "price": price.strip(),
+            "image": visual.get("image_url", "/placeholder.jpg")
+        })
+    return rows
+
+
+def _handle_product_card(ctx: _ProjectContext, comp_info: dict) -> None:
+    ctx.product_card_count += 1
+    ctx.emit_component("ProductCard", _generate_product_card, comp_info["data"], ctx.tokens, imported=False)
+    
+    # Check if we have multiple product cards - need ProductGrid
+    if ctx.analysis["component_count"].get("product_card", 0) > 1:
+        if not ctx.has_product_grid:
+            product_cards = [c for c in ctx.components if c.get("type", "unknown") == "product_card"]
+            ctx.emit_component("ProductGrid", _generate_product_grid, product_cards, ctx.tokens)
+            ctx.has_product_grid = True
+            
+            # Collect product data - parse text to extract title and price
+            ctx.product_grid_data.extend(_product_grid_rows(product_cards))
+    
+    # Only render ProductGrid on first product card encounter
+    if ctx.product_card_count == 1 and ctx.has_product_grid:
+        ctx.component_renders.append("      <ProductGrid products={products} />\n")
+
+
+def _handle_feature_card(ctx: _ProjectContext, comp_info: dict) -> None:
+    ctx.feature_card_count += 1
+    if ctx.analysis["component_count"].get("feature_card", 0) > 1:
+        # The grid (file and render) comes from the first feature card
+        if ctx.feature_card_count == 1:
+            feature_cards = [c for c in ctx.components if c.get("type", "unknown") == "feature_card"]
+            ctx.emit_component("FeatureCardsGrid", _generate_feature_cards_grid, feature_cards, ctx.tokens)
+            ctx.component_renders.append("      <FeatureCardsGrid />\n")
+    else:
+        ctx.emit_component("FeatureCard", _generate_feature_card, comp_info["data"], ctx.tokens)
+        ctx.component_renders.append("      <FeatureCard title=\"Feature\" description=\"Description\" />\n")
+
+
+def _handle_button(ctx: _ProjectContext, comp_info: dict) -> None:
+    # Only CTA buttons are generated
+    if comp_info["data"].get("role") == "cta":
+        _handle_cta_button(ctx, comp_info)
+
+
+def _render_text(comp_data: dict) -> str:
+    text_content = comp_data.get("text", "Text")
+    visual = comp_data.get("visual") or _EMPTY
+    font_size = visual.get("font_size", "16px")
+    font_weight = visual.get("font_weight", "normal")
+    text_color = visual.get("text_color", "#1F2937")
+    # Try both text_align and text_alignment field names
+    text_align = visual.get("text_align") or visual.get("text_alignment", "left")
+    return f'      <Text text="{_jsx(text_content)}" fontSize="{_jsx(font_size)}" fontWeight="{_jsx(font_weight)}" textColor="{_jsx(text_color)}" align="{_jsx(text_align)}" />\n'
+
+
+def _render_cta_button(comp_data: dict) -> str:
+    return f'      <CTAButton text="{_jsx(comp_data.get("text", "Click Me"))}" />\n'
+
+
+def _render_label(comp_data: dict) -> str:
+    return f'      <Label text="{_jsx(comp_data.get("text", "Label"))}" />\n'
+
+
+def _render_text_input(comp_data: dict) -> str:
+    return f'      <TextInput placeholder="{_jsx(comp_data.get("text") or "Enter text")}" />\n'
+
+
+def _render_link(comp_data: dict) -> str:
+    return f'      <Link text="{_jsx(comp_data.get("text", "Link"))}" href="#" />\n'
+
+
+def _render_menu_item(comp_data: dict) -> str:
+    return f'      <MenuItem text="{_jsx(comp_data.get("text", "Menu Item"))}" />\n'
+
+
+def _render_price(comp_data: dict) -> str:
+    return f'      <Price text="{_jsx(comp_data.get("text", "Price"))}" />\n'
+
+
+_handle_cta_button = _component_handler("CTAButton", _generate_cta_button, _render_cta_button)
+_handle_hero_section = _component_handler("HeroSection", _generate_hero_section)
+_handle_text_input = _component_handler("TextInput", _generate_text_input, _render_text_input)
+
+# Blueprint component type -> handler (aliases share a handler)
+_HANDLERS: Dict[str, _Handler] = {
+    "header": _component_handler("Header", _generate_header),
+    "product_card": _handle_product_card,
+    "button": _handle_button,
+    "divider": _component_handler("Divider", _generate_divider),
+    "text": _component_handler("Text", _generate_text_element, _render_text),
+    "image": _component_handler("Image", _generate_image),
+    "hero_section": _handle_hero_section,
+    "hero": _handle_hero_section,
+    "text_section": _component_handler("TextSection", _generate_text_section),
+    "text_block": _component_handler("ContentSection", _generate_content_section),
+    "bullet_list": _component_handler("BulletList", _generate_bullet_list),
+    "feature_card": _handle_feature_card,
+    "footer": _component_handler("Footer", _generate_footer),
+    "label": _component_handler("Label", _generate_label, _render_label),
+    "text_input": _handle_text_input,
+    "input": _handle_text_input,
+    "link": _component_handler("Link", _generate_link, _render_link),
+    "menu_item": _component_handler("MenuItem", _generate_menu_item, _render_menu_item),
+    "price": _component_handler("Price", _generate_price, _render_price),
+}
+
+
+def _products_literal(products: List[dict]) -> str:
+    """JSON array for product grid rows (fixed id/title/price/image shape)."""
+    dumps = json.dumps
+    return "[" + ",".join(
+        f'{{"id":{p["id"]},"title":{dumps(p["title"])},"price":{dumps(p["price"])},"image":{dumps(p["image"])}}}'
+        for p in products
+    ) + "]"
+
+
+def _build_project(improved_json: dict, sink: Optional[Callable[[str, str], None]] = None) -> _ProjectContext:
+    """Generate every project file, passing each to sink (or ctx.files) as it is produced."""
+    
+    # Analyze blueprint structure
+    analysis = _analyze_blueprint(improved_json)
+    tokens = _TokenView.from_tokens(improved_json.get("tokens", {}))
+    components = improved_json.get("components", [])
+    
+    # Initialize files dict - always include tokens
+    ctx = _ProjectContext(tokens=tokens, analysis=analysis, components=components, sink=sink)
+    ctx.emit("tokens.js", _generate_tokens_js(tokens))
+    
+    # Single pass: generate each component file on first use and build
+    # component renders in blueprint order
+    fired = set()  # "once" handlers that already ran
+    # Bound methods hoisted out of the per-component loop
+    get_handler = _HANDLERS.get
+    repeat_render = _REPEAT_RENDERS.get
+    renders_append = ctx.component_renders.append
+    fired_add = fired.add
+    for comp_info in analysis["component_list"]:
+        handler = get_handler(comp_info["type"])
+        if handler is None:
+            continue
+        if handler in fired:
+            renders_append(repeat_render(handler)(comp_info["data"]))
+            continue
+        handler(ctx, comp_info)
+        if handler in _REPEAT_RENDERS:
+            fired_add(handler)
+    
+    # Build App.jsx with all components in correct order, straight into one buffer
+    buf = io.StringIO()
+    buf.write('import { tokens } from "./tokens";\n')
+    if ctx.imports:
+        buf.writelines(ctx.imports)
+    else:
+        buf.write("// No components\n")
+    buf.write("\nexport default function App() {\n")
+    
+    # Include product data if using ProductGrid
+    if ctx.has_product_grid:
+        buf.write("  const products = ")
+        buf.write(_products_literal(ctx.product_grid_data))
+        buf.write(";\n  \n")
+    
+    buf.write('  return (\n    <div className="min-h-screen bg-white">\n')
+    if ctx.component_renders:
+        buf.writelines(ctx.component_renders)
+    else:
+        buf.write("      <div>No components</div>\n")
+    buf.write("    </div>\n  );\n}\n")
+    
+    ctx.emit("src/App.jsx", buf.getvalue())
+    return ctx
+
+
 def generate_react_project(improved_json: dict) -> dict:
     """
     Generate React + Tailwind code from improved blueprint JSON.
@@ -441,312 +920,35 @@ def generate_react_project(improved_json: dict) -> dict:
     Returns:
         dict: { "files": { path: content }, "entry": "src/App.jsx" }
     """
+    ctx = _build_project(improved_json)
     
-    # Analyze blueprint structure
-    analysis = _analyze_blueprint(improved_json)
-    tokens = improved_json.get("tokens", {})
-    components = improved_json.get("components", [])
+    return {
+        "files": ctx.files,
+        "entry": "src/App.jsx"
+    }
+
+
+def generate_react_project_stream(improved_json: dict, fileobj: BinaryIO) -> str:
+    """
+    Generate the project straight into an uncompressed tar stream.
     
-    # Initialize files dict - always include tokens
-    files = {}
-    files["tokens.js"] = _generate_tokens_js(improved_json)
+    Each file is written to fileobj as soon as it is generated; no files
+    dict is built.
     
-    # Track generated components and their imports
-    imports = []
-    component_renders = []  # Will track components in blueprint order
-    generated_components = set()
-    product_grid_data = []  # Store products for grid rendering
-    has_product_grid = False
+    Args:
+        improved_json: Improved blueprint from autocorrect
+        fileobj: Writable binary file object receiving the tar archive
     
-    # First pass: generate all component files needed
-    for comp_info in analysis["component_list"]:
-        comp_type = comp_info["type"]
-        comp_data = comp_info["data"]
-        comp_id = comp_info["id"]
-        
-        if comp_type == "header" and "Header" not in generated_components:
-            files["src/components/Header.jsx"] = _generate_header(comp_data, tokens)
-            imports.append('import Header from "./components/Header";')
-            generated_components.add("Header")
-        
-        elif comp_type == "product_card":
-            if "ProductCard" not in generated_components:
-                files["src/components/ProductCard.jsx"] = _generate_product_card(comp_data, tokens)
-                generated_components.add("ProductCard")
-            
-            # Check if we have multiple product cards - need ProductGrid
-            if analysis["component_count"].get("product_card", 0) > 1:
-                if "ProductGrid" not in generated_components:
-                    files["src/components/ProductGrid.jsx"] = _generate_product_grid(
-                        analysis["component_types"].get("product_card", []), tokens
-                    )
-                    imports.append('import ProductGrid from "./components/ProductGrid";')
-                    generated_components.add("ProductGrid")
-                    has_product_grid = True
-                    
-                    # Collect product data - parse text to extract title and price
-                    for i, pc in enumerate(analysis["component_types"].get("product_card", [])):
-                        visual = pc.get("visual", {})
-                        text_content = pc.get("text", "Product")
-                        
-                        # Parse text field - try multiple formats:
-                        # 1. "Title\nPrice" (newline separated)
-                        # 2. "Title Price" (space separated with price starting with $)
-                        # 3. "Title" (just title, use fallback price)
-                        
-                        title = text_content
-                        price = None
-                        
-                        # Try newline split first
-                        if "\n" in text_content:
-                            parts = text_content.split("\n", 1)
-                            title = parts[0].strip()
-                            price = parts[1].strip()
-                        else:
-                            # Try to find price pattern ($ followed by digits)
-                            import re
-                            price_match = re.search(r'\$[\d.]+', text_content)
-                            if price_match:
-                                price = price_match.group()
-                                # Remove price from text to get title
-                                title = text_content.replace(price, "").strip()
-                        
-                        # Fallback if no price found
-                        if not price:
-                            price = visual.get("price", f"${(i+1)*10 + 9}.99")
-                        
-                        # Ensure title is not empty
-                        if not title or title == "$":
-                            title = "Product"
-                        
-                        product_grid_data.append({
-                            "id": i + 1,
-                            "title": title.strip(),
-                            "price": price.strip(),
-                            "image": visual.get("image_url", "/placeholder.jpg")
-                        })
-        
-        elif comp_type == "button" and comp_data.get("role") == "cta":
-            if "CTAButton" not in generated_components:
-                files["src/components/CTAButton.jsx"] = _generate_cta_button(comp_data, tokens)
-                imports.append('import CTAButton from "./components/CTAButton";')
-                generated_components.add("CTAButton")
-        
-        elif comp_type == "divider":
-            if "Divider" not in generated_components:
-                files["src/components/Divider.jsx"] = _generate_divider(comp_data, tokens)
-                imports.append('import Divider from "./components/Divider";')
-                generated_components.add("Divider")
-        
-        elif comp_type == "text":
-            if "Text" not in generated_components:
-                files["src/components/Text.jsx"] = _generate_text_element(comp_data, tokens)
-                imports.append('import Text from "./components/Text";')
-                generated_components.add("Text")
-        
-        elif comp_type == "image":
-            if "Image" not in generated_components:
-                files["src/components/Image.jsx"] = _generate_image(comp_data, tokens)
-                imports.append('import Image from "./components/Image";')
-                generated_components.add("Image")
-        
-        elif comp_type == "hero_section":
-            if "HeroSection" not in generated_components:
-                files["src/components/HeroSection.jsx"] = _generate_hero_section(comp_data, tokens)
-                imports.append('import HeroSection from "./components/HeroSection";')
-                generated_components.add("HeroSection")
-        
-        elif comp_type == "hero":
-            if "HeroSection" not in generated_components:
-                files["src/components/HeroSection.jsx"] = _generate_hero_section(comp_data, tokens)
-                imports.append('import HeroSection from "./components/HeroSection";')
-                generated_components.add("HeroSection")
-        
-        elif comp_type == "text_section":
-            if "TextSection" not in generated_components:
-                files["src/components/TextSection.jsx"] = _generate_text_section(comp_data, tokens)
-                imports.append('import TextSection from "./components/TextSection";')
-                generated_components.add("TextSection")
-        
-        elif comp_type == "text_block":
-            if "ContentSection" not in generated_components:
-                files["src/components/ContentSection.jsx"] = _generate_content_section(comp_data, tokens)
-                imports.append('import ContentSection from "./components/ContentSection";')
-                generated_components.add("ContentSection")
-        
-        elif comp_type == "bullet_list":
-            if "BulletList" not in generated_components:
-                files["src/components/BulletList.jsx"] = _generate_bullet_list(comp_data, tokens)
-                imports.append('import BulletList from "./components/BulletList";')
-                generated_components.add("BulletList")
-        
-        elif comp_type == "feature_card":
-            if analysis["component_count"].get("feature_card", 0) > 1:
-                if "FeatureCardsGrid" not in generated_components:
-                    files["src/components/FeatureCardsGrid.jsx"] = _generate_feature_cards_grid(
-                        analysis["component_types"].get("feature_card", []), tokens
-                    )
-                    imports.append('import FeatureCardsGrid from "./components/FeatureCardsGrid";')
-                    generated_components.add("FeatureCardsGrid")
-            else:
-                if "FeatureCard" not in generated_components:
-                    files["src/components/FeatureCard.jsx"] = _generate_feature_card(comp_data, tokens)
-                    imports.append('import FeatureCard from "./components/FeatureCard";')
-                    generated_components.add("FeatureCard")
-        
-        elif comp_type == "footer":
-            if "Footer" not in generated_components:
-                files["src/components/Footer.jsx"] = _generate_footer(comp_data, tokens)
-                imports.append('import Footer from "./components/Footer";')
-                generated_components.add("Footer")
-        
-        elif comp_type == "label":
-            if "Label" not in generated_components:
-                files["src/components/Label.jsx"] = _generate_label(comp_data, tokens)
-                imports.append('import Label from "./components/Label";')
-                generated_components.add("Label")
-        
-        elif comp_type == "text_input" or comp_type == "input":
-            if "TextInput" not in generated_components:
-                files["src/components/TextInput.jsx"] = _generate_text_input(comp_data, tokens)
-                imports.append('import TextInput from "./components/TextInput";')
-                generated_components.add("TextInput")
-        
-        elif comp_type == "link":
-            if "Link" not in generated_components:
-                files["src/components/Link.jsx"] = _generate_link(comp_data, tokens)
-                imports.append('import Link from "./components/Link";')
-                generated_components.add("Link")
-        
-        elif comp_type == "menu_item":
-            if "MenuItem" not in generated_components:
-                files["src/components/MenuItem.jsx"] = _generate_menu_item(comp_data, tokens)
-                imports.append('import MenuItem from "./components/MenuItem";')
-                generated_components.add("MenuItem")
-        
-        elif comp_type == "price":
-            if "Price" not in generated_components:
-                files["src/components/Price.jsx"] = _generate_price(comp_data, tokens)
-                imports.append('import Price from "./components/Price";')
-                generated_components.add("Price")
-    
-    # Second pass: build component renders in blueprint order
-    product_card_count = 0
-    feature_card_count = 0
-    for comp_info in analysis["component_list"]:
-        comp_type = comp_info["type"]
-        
-        if comp_type == "header":
-            component_renders.append("<Header />")
-        
-        elif comp_type == "product_card":
-            product_card_count += 1
-            # Only render ProductGrid on first product card encounter
-            if product_card_count == 1 and has_product_grid:
-                component_renders.append("<ProductGrid products={products} />")
-        
-        elif comp_type == "hero_section":
-            component_renders.append("<HeroSection />")
-        
-        elif comp_type == "hero":
-            component_renders.append("<HeroSection />")
-        
-        elif comp_type == "text_section":
-            component_renders.append("<TextSection />")
-        
-        elif comp_type == "text_block":
-            component_renders.append("<ContentSection />")
-        
-        elif comp_type == "bullet_list":
-            component_renders.append("<BulletList />")
-        
-        elif comp_type == "feature_card":
-            feature_card_count += 1
-            # Only render FeatureCardsGrid on first feature card encounter if multiple
-            if feature_card_count == 1 and analysis["component_count"].get("feature_card", 0) > 1:
-                component_renders.append("<FeatureCardsGrid />")
-            elif feature_card_count == 1 and analysis["component_count"].get("feature_card", 0) == 1:
-                component_renders.append("<FeatureCard title=\"Feature\" description=\"Description\" />")
-        
-        elif comp_type == "button" and comp_info["data"].get("role") == "cta":
-            button_text = comp_info["data"].get("text", "Click Me")
-            component_renders.append(f'<CTAButton text="{button_text}" />')
-        
-        elif comp_type == "divider":
-            component_renders.append('<Divider />')
-        
-        elif comp_type == "text":
-            text_content = comp_info["data"].get("text", "Text")
-            visual = comp_info["data"].get("visual", {})
-            font_size = visual.get("font_size", "16px")
-            font_weight = visual.get("font_weight", "normal")
-            text_color = visual.get("text_color", "#1F2937")
-            # Try both text_align and text_alignment field names
-            text_align = visual.get("text_align") or visual.get("text_alignment", "left")
-            component_renders.append(f'<Text text="{text_content}" fontSize="{font_size}" fontWeight="{font_weight}" textColor="{text_color}" align="{text_align}" />')
-        
-        elif comp_type == "image":
-            component_renders.append('<Image />')
-        
-        elif comp_type == "label":
-            label_text = comp_info["data"].get("text", "Label")
-            component_renders.append(f'<Label text="{label_text}" />')
-        
-        elif comp_type == "text_input" or comp_type == "input":
-            placeholder = comp_info["data"].get("text") or "Enter text"
-            component_renders.append(f'<TextInput placeholder="{placeholder}" />')
-        
-        elif comp_type == "link":
-            link_text = comp_info["data"].get("text", "Link")
-            component_renders.append(f'<Link text="{link_text}" href="#" />')
-        
-        elif comp_type == "menu_item":
-            item_text = comp_info["data"].get("text", "Menu Item")
-            component_renders.append(f'<MenuItem text="{item_text}" />')
-        
-        elif comp_type == "price":
-            price_text = comp_info["data"].get("text", "Price")
-            component_renders.append(f'<Price text="{price_text}" />')
+    Returns:
+        str: Entry path inside the archive ("src/App.jsx")
+    """
+    with tarfile.open(fileobj=fileobj, mode="w|", encoding="utf-8") as tar:
+        def add_file(path: str, content: str) -> None:
+            data = content.encode("utf-8")
+            info = tarfile.TarInfo(path)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
         
-        elif comp_type == "footer":
-            component_renders.append("<Footer />")
-    
-    # Build App.jsx with all components in correct order
-    import_section = "\n".join(imports) if imports else "// No components"
-    
-    # Build render section - include product data if using ProductGrid
-    render_items = "\n      ".join(component_renders) if component_renders else "<div>No components</div>"
-    
-    if has_product_grid:
-        # Use JSON for proper formatting
-        import json
-        products_str = json.dumps(product_grid_data)
-        render_section = f"""
-  const products = {products_str};
-  
-  return (
-    <div className="min-h-screen bg-white">
-      {render_items}
-    </div>
-  );"""
-    else:
-        render_section = f"""
-  return (
-    <div className="min-h-screen bg-white">
-      {render_items}
-    </div>
-  );"""
-    
-    app_content = f'''import {{ tokens }} from "./tokens";
-{import_section}
-
-export default function App() {{{render_section}
-}}
-'''
+        _build_project(improved_json, add_file)
     
-    files["src/App.jsx"] = app_content
-    
-    return {
-        "files": files,
-        "entry": "src/App.jsx"
-    }
+    return "src/App.jsx"
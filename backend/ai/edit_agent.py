@@ -1,10 +1,53 @@
-import copy
+import hashlib
 import json
 import re
+from collections import OrderedDict
 from typing import Tuple, Optional
 from backend.ai import llm_client
 from backend.utils.blueprint_validator import validate_blueprint, BlueprintValidationError
 
+# Optional fast JSON encoder; output matches the compact json fallback
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _compact_json(value) -> str:
+    """Compact JSON text (orjson when available), e.g. a blueprint for a prompt."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value).decode()
+        except TypeError:
+            # orjson.JSONEncodeError (e.g. an int above 64 bits); json handles it
+            pass
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def _blueprint_digest(blueprint: dict) -> str:
+    """Hash of the blueprint's canonical (sorted-key) JSON."""
+    canonical = None
+    if orjson is not None:
+        try:
+            canonical = orjson.dumps(blueprint, option=orjson.OPT_SORT_KEYS)
+        except TypeError:
+            # orjson.JSONEncodeError (e.g. an int above 64 bits); json handles it
+            pass
+    if canonical is None:
+        canonical = json.dumps(blueprint, separators=(",", ":"), sort_keys=True).encode()
+    return hashlib.blake2b(canonical, digest_size=16).hexdigest()
+
+
+# Raw LLM edit responses by (whitespace-normalized command, blueprint digest),
+# least recently used first. A response is cached only once it parsed to a
+# blueprint that preserved the schema, and is evicted if interpret_and_patch
+# then rejects it; hits are still re-parsed and re-checked
+_LLM_EDIT_CACHE: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+_LLM_EDIT_CACHE_SIZE = 512
+
+
+def _llm_edit_cache_key(command: str, blueprint: dict) -> Tuple[str, str]:
+    return " ".join(command.split()), _blueprint_digest(blueprint)
+
 
 def interpret_and_patch(command: str, blueprint: dict) -> Tuple[dict, str]:
     """
@@ -38,8 +81,8 @@ def interpret_and_patch(command: str, blueprint: dict) -> Tuple[dict, str]:
                 validate_blueprint(patched)
                 return patched, summary
             except BlueprintValidationError:
-                # LLM violated schema, fallback to deterministic
-                pass
+                # LLM violated schema: don't replay it, fallback to deterministic
+                _LLM_EDIT_CACHE.pop(_llm_edit_cache_key(command, blueprint), None)
     
     # Apply deterministic edits
     patched, summary = _apply_deterministic_edit(command, blueprint)
@@ -71,6 +114,8 @@ def _apply_llm_edit(command: str, blueprint: dict) -> Tuple[Optional[dict], str]
     Returns:
         tuple: (patched_blueprint or None, summary)
     """
+    cache_key = _llm_edit_cache_key(command, blueprint)
+    
     system_prompt = """You are a design blueprint editor. Your ONLY job is to modify JSON values.
 
 RULES:
@@ -88,26 +133,32 @@ Command types allowed:
 
 If the command cannot be expressed as numeric/color changes, return null."""
 
-    user_prompt = f"""Blueprint:
-{json.dumps(blueprint, indent=2)}
+    try:
+        response = _LLM_EDIT_CACHE.get(cache_key)
+        cached = response is not None
+        if cached:
+            _LLM_EDIT_CACHE.move_to_end(cache_key)
+        else:
+            user_prompt = f"""Blueprint:
+{_compact_json(blueprint)}
 
 Command: {command}
 
 Return ONLY the complete modified blueprint as JSON (or null if unsupported)."""
-
-    try:
-        response = llm_client.call_gemini_chat(
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            model="gemini-2.0-flash-exp"
-        )
+            
+            response = llm_client.call_gemini_chat(
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                model="gemini-2.0-flash-exp"
+            )
         
         if response is None or response.strip() == "null":
             return None, "LLM could not interpret command"
         
-        # Parse response
+        # Parse response (json, not orjson: orjson turns ints above 64 bits
+        # into floats and rejects NaN/Infinity, so echoed values would change)
         updated = json.loads(response)
         if not isinstance(updated, dict):
             return None, "LLM response was not a blueprint"
@@ -116,6 +167,11 @@ Return ONLY the complete modified blueprint as JSON (or null if unsupported)."""
         if not _validate_schema_preserved(updated, blueprint):
             return None, "LLM violated schema constraints"
         
+        if not cached:
+            _LLM_EDIT_CACHE[cache_key] = response
+            if len(_LLM_EDIT_CACHE) > _LLM_EDIT_CACHE_SIZE:
+                _LLM_EDIT_CACHE.popitem(last=False)
+        
         return updated, "Updated via LLM interpretation"
         
     except json.JSONDecodeError:
@@ -157,6 +213,131 @@ def _validate_schema_preserved(updated: dict, original: dict) -> bool:
 
 
 
+# Deterministic edit commands (matched against the lowercased command)
+_COLOR_RE = re.compile(r"change.*?(?P<which>primary|accent)\s+color\s+to\s+(?P<hex>#[0-9A-Fa-f]{6})")
+
+# Trigger keywords -> bit flag. One scan finds every keyword occurrence, also
+# inside longer words (a lookahead matches at each position; no keyword is a
+# prefix of another)
+_KEYWORD_FLAGS = {
+    keyword: 1 << bit
+    for bit, keyword in enumerate((
+        "make", "cta", "button", "bigger", "larger", "taller", "product",
+        "spacing", "gap", "margin", "more", "increase", "font", "size",
+    ))
+}
+_KEYWORD_SCAN_RE = re.compile("(?=(" + "|".join(_KEYWORD_FLAGS) + "))")
+
+
+def _keyword_mask(*keywords: str) -> int:
+    mask = 0
+    for keyword in keywords:
+        mask |= _KEYWORD_FLAGS[keyword]
+    return mask
+
+
+def _keyword_flags(cmd_lower: str) -> int:
+    """OR of the flags of every trigger keyword in the command."""
+    flags = 0
+    for match in _KEYWORD_SCAN_RE.finditer(cmd_lower):
+        flags |= _KEYWORD_FLAGS[match.group(1)]
+    return flags
+
+
+# Edits never mutate the blueprint they are given: they return a copy that
+# shares everything except the dicts/lists on the path they change
+
+def _edit_color(blueprint: dict, match: re.Match) -> Tuple[dict, str]:
+    """Pattern 1: Color changes (STRICT hex validation)."""
+    new_color = match.group("hex")
+    which = match.group("which")
+    patched = dict(blueprint)
+    if "tokens" in patched:
+        patched["tokens"] = {**patched["tokens"], f"{which}_color": new_color}
+    return patched, f"Changed {which} color to {new_color}"
+
+
+def _edit_button_height(blueprint: dict) -> Tuple[dict, str]:
+    """Pattern 2: Button/CTA height increase."""
+    patched = dict(blueprint)
+    summary = ""
+    if "components" in patched:
+        components = patched["components"] = list(patched["components"])
+        for i, comp in enumerate(components):
+            if comp.get("role") == "cta" or comp.get("type") in ["button", "cta"]:
+                # Modify bbox height (index 3)
+                bbox = list(comp.get("bbox", [0, 0, 100, 44]))
+                old_height = bbox[3]
+                bbox[3] = int(old_height * 1.2)
+                components[i] = {**comp, "bbox": bbox}
+                summary = f"Increased button height from {int(old_height)}px to {int(bbox[3])}px"
+    return patched, summary or "No CTA button found to enlarge"
+
+
+def _edit_product_size(blueprint: dict) -> Tuple[dict, str]:
+    """Pattern 3: Product cards scaling."""
+    patched = dict(blueprint)
+    scaled = False
+    if "components" in patched:
+        components = patched["components"] = list(patched["components"])
+        for i, comp in enumerate(components):
+            if comp.get("type") == "product_card":
+                bbox = comp.get("bbox", [0, 0, 300, 300])
+                new_bbox = [
+                    bbox[0],
+                    bbox[1],
+                    int(bbox[2] * 1.2),
+                    int(bbox[3] * 1.2),
+                ]
+                components[i] = {**comp, "bbox": new_bbox}
+                scaled = True
+    if scaled:
+        return patched, "Increased product card size by 20%"
+    return patched, "No product cards found to enlarge"
+
+
+def _edit_spacing(blueprint: dict) -> Tuple[dict, str]:
+    """Pattern 4: Spacing increase."""
+    patched = dict(blueprint)
+    if "tokens" in patched and "base_spacing" in patched["tokens"]:
+        old_spacing = patched["tokens"]["base_spacing"]
+        new_spacing = int(old_spacing * 1.2)
+        patched["tokens"] = {**patched["tokens"], "base_spacing": new_spacing}
+        return patched, f"Increased base spacing from {old_spacing}px to {new_spacing}px"
+    return patched, "No base spacing found to modify"
+
+
+def _edit_font_size(blueprint: dict) -> Tuple[dict, str]:
+    """Pattern 5: Font size increase."""
+    patched = dict(blueprint)
+    modified = False
+    if "components" in patched:
+        components = patched["components"] = list(patched["components"])
+        for i, comp in enumerate(components):
+            if "visual" in comp and comp["visual"] is not None:
+                if "font_size" in comp["visual"]:
+                    visual = comp["visual"]
+                    components[i] = {**comp, "visual": {**visual, "font_size": int(visual["font_size"] * 1.2)}}
+                    modified = True
+    if modified:
+        return patched, "Increased font sizes by 20% across components"
+    return patched, "No components with font_size found"
+
+
+# (keyword masks, edit) in priority order after color changes: the edit runs
+# when the command has a keyword from every mask
+_KEYWORD_EDITS = (
+    ((_keyword_mask("make"), _keyword_mask("cta", "button"), _keyword_mask("bigger", "larger", "taller")),
+     _edit_button_height),
+    ((_keyword_mask("make"), _keyword_mask("product"), _keyword_mask("bigger", "larger")),
+     _edit_product_size),
+    ((_keyword_mask("spacing", "gap", "margin"), _keyword_mask("more", "increase", "bigger")),
+     _edit_spacing),
+    ((_keyword_mask("font"), _keyword_mask("size"), _keyword_mask("increase", "bigger", "larger")),
+     _edit_font_size),
+)
+
+
 def _apply_deterministic_edit(command: str, blueprint: dict) -> Tuple[dict, str]:
     """
     Apply rule-based deterministic edits.
@@ -177,88 +358,17 @@ def _apply_deterministic_edit(command: str, blueprint: dict) -> Tuple[dict, str]
     Returns:
         tuple: (patched_blueprint, summary)
     """
-    patched = copy.deepcopy(blueprint)
-    summary = ""
-    
     cmd_lower = command.lower()
     
-    # Pattern 1: Color changes (STRICT hex validation)
-    color_match = re.search(r"change.*?(?:primary|accent)\s+color\s+to\s+(#[0-9A-Fa-f]{6})", cmd_lower)
+    color_match = _COLOR_RE.search(cmd_lower)
     if color_match:
-        new_color = color_match.group(1)
-        # Extract which color (primary or accent)
-        if "accent" in cmd_lower:
-            if "tokens" in patched:
-                patched["tokens"]["accent_color"] = new_color
-            summary = f"Changed accent color to {new_color}"
-        else:
-            if "tokens" in patched:
-                patched["tokens"]["primary_color"] = new_color
-            summary = f"Changed primary color to {new_color}"
-        return patched, summary
-    
-    # Pattern 2: Button/CTA height increase
-    if "make" in cmd_lower and ("cta" in cmd_lower or "button" in cmd_lower) and ("bigger" in cmd_lower or "larger" in cmd_lower or "taller" in cmd_lower):
-        if "components" in patched:
-            for comp in patched["components"]:
-                if comp.get("role") == "cta" or comp.get("type") in ["button", "cta"]:
-                    # Modify bbox height (index 3)
-                    bbox = comp.get("bbox", [0, 0, 100, 44])
-                    old_height = bbox[3]
-                    bbox[3] = int(old_height * 1.2)
-                    comp["bbox"] = bbox
-                    summary = f"Increased button height from {int(old_height)}px to {int(bbox[3])}px"
-        if not summary:
-            summary = "No CTA button found to enlarge"
-        return patched, summary
+        return _edit_color(blueprint, color_match)
     
-    # Pattern 3: Product cards scaling
-    if "make" in cmd_lower and "product" in cmd_lower and ("bigger" in cmd_lower or "larger" in cmd_lower):
-        scaled = False
-        if "components" in patched:
-            for comp in patched["components"]:
-                if comp.get("type") == "product_card":
-                    bbox = comp.get("bbox", [0, 0, 300, 300])
-                    new_bbox = [
-                        bbox[0],
-                        bbox[1],
-                        int(bbox[2] * 1.2),
-                        int(bbox[3] * 1.2),
-                    ]
-                    comp["bbox"] = new_bbox
-                    scaled = True
-        if scaled:
-            summary = "Increased product card size by 20%"
-        else:
-            summary = "No product cards found to enlarge"
-        return patched, summary
-    
-    # Pattern 4: Spacing increase
-    if ("spacing" in cmd_lower or "gap" in cmd_lower or "margin" in cmd_lower) and ("more" in cmd_lower or "increase" in cmd_lower or "bigger" in cmd_lower):
-        if "tokens" in patched and "base_spacing" in patched["tokens"]:
-            old_spacing = patched["tokens"]["base_spacing"]
-            patched["tokens"]["base_spacing"] = int(old_spacing * 1.2)
-            summary = f"Increased base spacing from {old_spacing}px to {int(patched['tokens']['base_spacing'])}px"
-        else:
-            summary = "No base spacing found to modify"
-        return patched, summary
-    
-    # Pattern 5: Font size increase
-    if "font" in cmd_lower and "size" in cmd_lower and ("increase" in cmd_lower or "bigger" in cmd_lower or "larger" in cmd_lower):
-        modified = False
-        if "components" in patched:
-            for comp in patched["components"]:
-                if "visual" in comp and comp["visual"] is not None:
-                    if "font_size" in comp["visual"]:
-                        old_size = comp["visual"]["font_size"]
-                        comp["visual"]["font_size"] = int(old_size * 1.2)
-                        modified = True
-        if modified:
-            summary = "Increased font sizes by 20% across components"
-        else:
-            summary = "No components with font_size found"
-        return patched, summary
+    flags = _keyword_flags(cmd_lower)
+    for masks, edit in _KEYWORD_EDITS:
+        if all(flags & mask for mask in masks):
+            return edit(blueprint)
     
     # Unsupported command
     summary = f"Command not supported: '{command}'. Supported: color changes, button sizing, product scaling, spacing, font sizes"
-    return patched, summary
+    return dict(blueprint), summary
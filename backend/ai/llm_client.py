@@ -11,10 +11,15 @@ Environment Variables:
 
 import os
 import json
-import base64
-import re
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 
+# Optional dependency, imported once (only needed when AI_MODE is on)
+try:
+    import google.generativeai as genai
+except ImportError:
+    genai = None
+
 
 def is_ai_mode_on() -> bool:
     """
@@ -27,6 +32,20 @@ def is_ai_mode_on() -> bool:
     return ai_mode == "on"
 
 
+@lru_cache(maxsize=1)
+def _configure(api_key: str) -> None:
+    """Configure the Gemini SDK; repeated calls with the same key are free."""
+    genai.configure(api_key=api_key)
+
+
+@lru_cache(maxsize=8)
+def _model(model_name: str, system_instruction: Optional[str] = None):
+    """Shared GenerativeModel per (model name, system instruction), reusing its client."""
+    if system_instruction is None:
+        return genai.GenerativeModel(model_name)
+    return genai.GenerativeModel(model_name, system_instruction=system_instruction)
+
+
 def call_gemini_chat(
     messages: List[Dict[str, str]],
     model: str = "gemini-1.5-flash"
@@ -41,9 +60,7 @@ def call_gemini_chat(
     Returns:
         str: Response text, or None if API call fails
     """
-    try:
-        import google.generativeai as genai
-    except ImportError:
+    if genai is None:
         raise ImportError(
             "google-generativeai package required for AI_MODE. Install with: pip install google-generativeai"
         )
@@ -53,21 +70,27 @@ def call_gemini_chat(
         print("GOOGLE_API_KEY not set. Cannot use Gemini API.")
         return None
     
-    genai.configure(api_key=api_key)
+    _configure(api_key)
     
     try:
         # Use correct model format for current API
         model_name = "gemini-1.5-flash" if not model.startswith("models/") else model
-        model_obj = genai.GenerativeModel(model_name)
-        # Convert messages to Gemini format
-        chat = model_obj.start_chat()
-        
+        # Convert messages to Gemini format: system messages become the model's
+        # system instruction, the rest are sent together in one request
+        system_parts = []
+        contents = []
         for msg in messages:
             role = msg.get("role", "user")
             content = msg.get("content", "")
-            chat.send_message(content)
+            if role == "system":
+                system_parts.append(content)
+            else:
+                contents.append(content)
         
-        return chat.last.text
+        model_obj = _model(model_name, "\n\n".join(system_parts) if system_parts else None)
+        response = model_obj.generate_content(contents)
+        
+        return response.text
     except Exception as e:
         print(f"Gemini API error: {e}")
         return None
@@ -93,9 +116,7 @@ def analyze_image_with_llm(image_path: str) -> Optional[Dict[str, Any]]:
         print(f"Image file not found: {image_path}")
         return None
     
-    try:
-        import google.generativeai as genai
-    except ImportError:
+    if genai is None:
         print("google-generativeai package not installed. Cannot use LLM vision.")
         return None
     
@@ -104,7 +125,7 @@ def analyze_image_with_llm(image_path: str) -> Optional[Dict[str, Any]]:
         print("GOOGLE_API_KEY not set. Cannot use Gemini vision.")
         return None
     
-    genai.configure(api_key=api_key)
+    _configure(api_key)
     
     # Determine image type
     image_ext = os.path.splitext(image_path)[1].lower()
@@ -147,7 +168,7 @@ Generate a complete blueprint JSON response."""
 
     try:
         # Use gemini-2.0-flash-exp which is stable and available
-        model = genai.GenerativeModel("gemini-2.0-flash-exp")
+        model = _model("gemini-2.0-flash-exp")
         
         with open(image_path, "rb") as f:
             image_bytes = f.read()
@@ -155,9 +176,10 @@ Generate a complete blueprint JSON response."""
         response = model.generate_content(
             [
                 system_prompt,
+                # Raw bytes: the SDK encodes them itself, no base64 str copy here
                 {
                     "mime_type": mime_type,
-                    "data": base64.standard_b64encode(image_bytes).decode("utf-8")
+                    "data": image_bytes
                 },
                 user_prompt
             ]
@@ -170,11 +192,12 @@ Generate a complete blueprint JSON response."""
             blueprint = json.loads(response_text)
             return blueprint
         except json.JSONDecodeError:
-            # Try regex extraction
-            json_match = re.search(r"\{.*\}", response_text, re.DOTALL)
-            if json_match:
+            # Try the span from the first "{" to the last "}" (e.g. JSON in a code fence)
+            start = response_text.find("{")
+            end = response_text.rfind("}")
+            if start != -1 and end > start:
                 try:
-                    blueprint = json.loads(json_match.group(0))
+                    blueprint = json.loads(response_text[start:end + 1])
                     return blueprint
                 except json.JSONDecodeError:
                     print("Failed to extract valid JSON from Gemini response")
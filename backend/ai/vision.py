@@ -37,7 +37,8 @@ def image_to_raw_json(image_path: str) -> dict:
         image_path: Path to uploaded image file
     
     Returns:
-        dict: Blueprint with components and tokens
+        dict: Blueprint with components and tokens (stub blueprints are
+        shared, so do not mutate the result in place)
     """
     if llm_client.is_ai_mode_on():
         blueprint = llm_client.analyze_image_with_llm(image_path)
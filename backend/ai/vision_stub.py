@@ -5,6 +5,7 @@ or when LLM processing fails. Implements blueprint branching based on filename.
 """
 
 import os
+import re
 
 
 def image_to_raw_json_stub(image_path: str) -> dict:
@@ -25,19 +26,19 @@ def image_to_raw_json_stub(image_path: str) -> dict:
         image_path: Path to image file (used for filename branching)
     
     Returns:
-        dict: Deterministic blueprint matching schema
+        dict: Deterministic blueprint matching schema. It is shared across
+        calls, so callers must not mutate it in place (use the
+        _create_*_blueprint builders for a private copy)
     """
     
     # Extract filename for branching logic
     filename = os.path.basename(image_path).lower()
     
     # Branching logic based on filename
-    if "store" in filename or "product" in filename:
-        return _create_storefront_blueprint()
-    elif "about" in filename or "company" in filename:
-        return _create_content_blueprint()
-    else:
-        return _create_landing_blueprint()
+    for keywords, blueprint in _STUB_BRANCHES:
+        if keywords.search(filename):
+            return blueprint
+    return _LANDING_BLUEPRINT
 
 
 def _create_storefront_blueprint() -> dict:
@@ -274,3 +275,15 @@ def _create_landing_blueprint() -> dict:
             "vision_confidence": 0.92
         }
     }
+
+
+# Stub blueprints, built once at import and shared read-only
+_STOREFRONT_BLUEPRINT = _create_storefront_blueprint()
+_CONTENT_BLUEPRINT = _create_content_blueprint()
+_LANDING_BLUEPRINT = _create_landing_blueprint()
+
+# Filename keywords -> stub blueprint, in priority order (else landing page)
+_STUB_BRANCHES = (
+    (re.compile(r"store|product"), _STOREFRONT_BLUEPRINT),
+    (re.compile(r"about|company"), _CONTENT_BLUEPRINT),
+)
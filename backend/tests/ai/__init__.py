@@ -0,0 +1 @@
+"""AI module tests init."""
@@ -0,0 +1,40 @@
+"""
+AUTOCORRECT TESTS
+
+Tests validate:
+- base_spacing snapping to multiples of 8 (integer halves round up)
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+import pytest
+
+from backend.ai.autocorrect import _snap, improve_blueprint
+
+
+@pytest.mark.parametrize("value, expected", [
+    (0, 0), (3, 0), (4, 8), (5, 8), (8, 8), (11, 8), (12, 16), (20, 24), (-4, 0), (-5, -8),
+])
+def test_integer_snap_rounds_half_up(value, expected):
+    """Integer halves go up, so 4 snaps to 8 rather than 0."""
+    assert _snap(value, 8) == expected
+
+
+def test_float_snap_keeps_round():
+    """Floats keep round() (halves to even)."""
+    assert _snap(4.0, 8) == 0
+    assert _snap(12.0, 8) == 16
+    assert _snap(13.5, 8) == 16
+
+
+def test_improve_blueprint_snaps_base_spacing():
+    """The snapped value is logged and the input is left untouched."""
+    raw = {"tokens": {"base_spacing": 4}, "components": []}
+    
+    improved, changelog = improve_blueprint(raw)
+    
+    assert improved["tokens"]["base_spacing"] == 8
+    assert changelog == ["Snapped base_spacing 4 → 8"]
+    assert raw["tokens"]["base_spacing"] == 4
@@ -0,0 +1,104 @@
+"""
+CHANGE PLANNER TESTS
+
+Tests validate:
+- Resize planning from both intent forms (SizeDelta and "op_percent" string)
+- In-place blueprint edits between plans are seen by the component index
+- Index lookups are not exposed to callers for mutation
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from backend.ai.agent.change_planner import ChangePlanner, _BlueprintIndex
+from backend.ai.agent.intent_parser import ComponentTarget, IntentType, ParsedIntent, SizeDelta
+
+
+def _cta_blueprint(height=60):
+    return {
+        "components": [
+            {"id": "hero", "type": "header", "role": "hero", "text": "Welcome",
+             "visual": {"height": 80}},
+            {"id": "cta", "type": "button", "role": "cta", "text": "Buy",
+             "visual": {"height": height}},
+            {"id": "footer", "type": "footer", "role": "content", "text": "Bye",
+             "visual": {"height": 40}},
+        ]
+    }
+
+
+def _resize_intent(parameters, role="cta"):
+    return ParsedIntent(
+        IntentType.RESIZE_COMPONENT, 0.9, ComponentTarget(role=role), parameters
+    )
+
+
+def _height_patch(plan):
+    assert plan.executable, plan.rationale
+    return plan.planned_patches[0].field_patches[0]
+
+
+def test_resize_from_size_delta():
+    """Structured SizeDelta parameters drive the new height."""
+    planner = ChangePlanner()
+    delta = SizeDelta("increase", 50)
+    plan = planner.plan_changes(
+        _resize_intent({"size_direction": str(delta), "size_delta": delta}),
+        _cta_blueprint()
+    )
+    
+    field_patch = _height_patch(plan)
+    assert (field_patch.old_value, field_patch.new_value) == (60, 90)
+    assert field_patch.reason == "Size increase_50: 60 → 90px"
+
+
+def test_resize_from_size_direction_string():
+    """The documented string form alone still resizes."""
+    planner = ChangePlanner()
+    
+    plan = planner.plan_changes(_resize_intent({"size_direction": "increase_50"}), _cta_blueprint())
+    field_patch = _height_patch(plan)
+    assert (field_patch.old_value, field_patch.new_value) == (60, 90)
+    assert field_patch.reason == "Size increase_50: 60 → 90px"
+    
+    plan = planner.plan_changes(
+        _resize_intent({"size_direction": "decrease_20"}, role="hero"), _cta_blueprint()
+    )
+    assert _height_patch(plan).new_value == 64
+
+
+def test_resize_unknown_direction_keeps_height():
+    """A direction without a percentage plans no height change."""
+    planner = ChangePlanner()
+    plan = planner.plan_changes(_resize_intent({"size_direction": "medium"}, role="hero"), _cta_blueprint())
+    
+    field_patch = _height_patch(plan)
+    assert field_patch.new_value == field_patch.old_value == 80
+
+
+def test_index_sees_in_place_component_edits():
+    """Editing a middle component between plans is picked up."""
+    planner = ChangePlanner()
+    blueprint = _cta_blueprint()
+    intent = _resize_intent({"size_direction": "increase_50"}, role="content")
+    
+    plan = planner.plan_changes(intent, blueprint)
+    assert [p.component_id for p in plan.planned_patches] == ["footer"]
+    
+    # Same list object, same length and end components; only a middle role changes
+    blueprint["components"][1]["role"] = "content"
+    plan = planner.plan_changes(intent, blueprint)
+    assert [p.component_id for p in plan.planned_patches] == ["cta", "footer"]
+
+
+def test_find_components_result_is_private():
+    """Mutating a lookup result leaves the index intact."""
+    planner = ChangePlanner()
+    index = _BlueprintIndex.build(_cta_blueprint())
+    
+    found = planner._find_components(ComponentTarget(role="cta"), index)
+    found.append({"id": "bogus"})
+    
+    assert [c["id"] for c in planner._find_components(ComponentTarget(role="cta"), index)] == ["cta"]
+    assert [c["id"] for c in planner._find_components(ComponentTarget(component_type="button"), index)] == ["cta"]
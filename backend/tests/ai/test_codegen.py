@@ -0,0 +1,79 @@
+"""
+CODEGEN TESTS
+
+Tests validate:
+- Blueprint text is escaped for every context it enters (JS strings, JSX
+  children, JSX attributes) across all component types
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+import pytest
+
+from backend.ai.codegen import generate_react_project
+
+
+PAYLOAD = 'Say "hi" & <b>'
+JS_ESCAPED = 'Say \\"hi\\" & \\u003cb>'
+JSX_ESCAPED = "Say &quot;hi&quot; &amp; &lt;b&gt;"
+
+# Component type -> generated file
+COMPONENT_FILES = {
+    "header": "Header",
+    "text": "Text",
+    "image": "Image",
+    "divider": "Divider",
+    "button": "CTAButton",
+    "label": "Label",
+    "text_input": "TextInput",
+    "link": "Link",
+    "hero": "HeroSection",
+}
+
+
+def _component(comp_type):
+    return {
+        "id": comp_type,
+        "type": comp_type,
+        "role": "cta",
+        "text": PAYLOAD,
+        "visual": {
+            "font_size": PAYLOAD,
+            "text_color": PAYLOAD,
+            "background_color": PAYLOAD,
+            "bg_color": PAYLOAD,
+            "border": PAYLOAD,
+            "border_color": PAYLOAD,
+            "color": PAYLOAD,
+            "thickness": PAYLOAD,
+        },
+    }
+
+
+@pytest.mark.parametrize("comp_type", sorted(COMPONENT_FILES))
+def test_component_text_is_escaped(comp_type):
+    """No raw quote, & or < from the blueprint reaches the generated files."""
+    blueprint = {
+        "tokens": {"primary_color": PAYLOAD, "accent_color": "#000000", "border_radius": PAYLOAD},
+        "components": [_component(comp_type)],
+    }
+    files = generate_react_project(blueprint)["files"]
+    source = files[f"src/components/{COMPONENT_FILES[comp_type]}.jsx"]
+    
+    assert PAYLOAD not in source
+    assert JS_ESCAPED in source
+    if comp_type == "header":
+        assert f">{JSX_ESCAPED}</h1>" in source
+    
+    assert PAYLOAD not in files["tokens.js"]
+    assert f'primaryColor: "{JS_ESCAPED}"' in files["tokens.js"]
+    assert PAYLOAD not in files["src/App.jsx"]
+
+
+def test_attribute_text_is_entity_escaped():
+    """Component text passed as a JSX attribute in App.jsx uses entities."""
+    files = generate_react_project({"components": [_component("label")]})["files"]
+    
+    assert f'<Label text="{JSX_ESCAPED}" />' in files["src/App.jsx"]
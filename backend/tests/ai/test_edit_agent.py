@@ -0,0 +1,152 @@
+"""
+EDIT AGENT TESTS
+
+Tests validate:
+- LLM edit replies are cached only after they parse and preserve the schema
+- Cached replies rejected by the blueprint validator are evicted
+- Blueprints orjson can't encode (ints above 64 bits) still edit deterministically
+- LLM replies parse exactly as json does (big ints stay ints, NaN is accepted)
+- Color edits update the token the command names, even when it mentions both
+"""
+
+import json
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+import pytest
+
+from backend.ai import edit_agent, llm_client
+
+
+def _blueprint(primary="#111111"):
+    return {
+        "screen_id": "home",
+        "screen_type": "storefront",
+        "tokens": {
+            "primary_color": primary,
+            "accent_color": "#222222",
+            "base_spacing": 8,
+            "border_radius": "8px",
+        },
+        "components": [
+            {"id": "cta", "type": "button", "role": "cta", "text": "Buy",
+             "bbox": [0, 0, 100, 44], "confidence": 0.9, "visual": {}},
+        ],
+    }
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    """Serve queued replies from call_gemini_chat and count the calls."""
+    edit_agent._LLM_EDIT_CACHE.clear()
+    calls = []
+    replies = []
+    
+    def call_gemini_chat(messages, model):
+        calls.append(messages)
+        return replies.pop(0) if replies else None
+    
+    monkeypatch.setattr(llm_client, "call_gemini_chat", call_gemini_chat)
+    monkeypatch.setattr(llm_client, "is_ai_mode_on", lambda: True)
+    yield calls, replies
+    edit_agent._LLM_EDIT_CACHE.clear()
+
+
+def test_valid_reply_is_cached(fake_llm):
+    """A reply that preserves the schema is replayed without a second call."""
+    calls, replies = fake_llm
+    replies.append(json.dumps(_blueprint("#333333")))
+    
+    first, _ = edit_agent._apply_llm_edit("make it  darker", _blueprint())
+    second, _ = edit_agent._apply_llm_edit("make it darker", _blueprint())
+    
+    assert first == second == _blueprint("#333333")
+    assert len(calls) == 1
+    assert len(edit_agent._LLM_EDIT_CACHE) == 1
+
+
+@pytest.mark.parametrize("reply", [
+    "null",
+    "not json",
+    "[1, 2]",
+    json.dumps({"components": [], "tokens": {}}),
+])
+def test_rejected_reply_is_not_cached(fake_llm, reply):
+    """Null, unparsable and schema-breaking replies ask the LLM again."""
+    calls, replies = fake_llm
+    replies.extend([reply, reply])
+    
+    for _ in range(2):
+        patched, _ = edit_agent._apply_llm_edit("make it darker", _blueprint())
+        assert patched is None
+    
+    assert len(calls) == 2
+    assert not edit_agent._LLM_EDIT_CACHE
+
+
+def test_reply_failing_validation_is_evicted(fake_llm):
+    """interpret_and_patch drops a cached reply the validator rejects."""
+    calls, replies = fake_llm
+    replies.append(json.dumps(_blueprint("not-a-color")))
+    
+    patched, _ = edit_agent.interpret_and_patch("make it darker", _blueprint())
+    
+    assert patched == _blueprint()
+    assert len(calls) == 1
+    assert not edit_agent._LLM_EDIT_CACHE
+
+
+def test_big_int_blueprint_falls_back_to_deterministic_edit(fake_llm):
+    """A token above 64 bits doesn't break the cache key or the fallback."""
+    blueprint = _blueprint()
+    blueprint["tokens"]["extra"] = 2 ** 70
+    
+    patched, summary = edit_agent.interpret_and_patch("make button taller", blueprint)
+    
+    assert summary == "Increased button height from 44px to 52px"
+    assert patched["tokens"]["extra"] == 2 ** 70
+
+
+def test_big_int_blueprint_reaches_the_llm(fake_llm):
+    """The prompt carries the blueprint even when orjson can't encode it."""
+    calls, replies = fake_llm
+    blueprint = _blueprint()
+    blueprint["tokens"]["extra"] = 2 ** 70
+    
+    edit_agent._apply_llm_edit("make it darker", blueprint)
+    
+    assert len(calls) == 1
+    assert '"extra":1180591620717411303424' in calls[0][1]["content"]
+
+
+def test_reply_values_parse_exactly(fake_llm):
+    """Echoed big ints and NaN survive the reply parse unchanged."""
+    calls, replies = fake_llm
+    replies.append(json.dumps(_blueprint()).replace(
+        '"base_spacing": 8', '"base_spacing": 18446744073709551616, "ratio": NaN'
+    ))
+    
+    patched, _ = edit_agent._apply_llm_edit("make it darker", _blueprint())
+    
+    assert patched["tokens"]["base_spacing"] == 2 ** 64
+    assert type(patched["tokens"]["base_spacing"]) is int
+    assert patched["tokens"]["ratio"] != patched["tokens"]["ratio"]
+
+
+@pytest.mark.parametrize("command, token, color", [
+    ("change primary color to #AABBCC", "primary_color", "#aabbcc"),
+    ("Change the accent color to #123456", "accent_color", "#123456"),
+    ("change primary color to #123456 to match the accent", "primary_color", "#123456"),
+    ("keep primary, change the accent color to #123456", "accent_color", "#123456"),
+])
+def test_color_edit_updates_named_token(command, token, color):
+    """The word right before "color to" picks the token."""
+    blueprint = _blueprint()
+    
+    patched, summary = edit_agent._apply_deterministic_edit(command, blueprint)
+    
+    which = token.split("_")[0]
+    assert patched["tokens"] == {**blueprint["tokens"], token: color}
+    assert summary == f"Changed {which} color to {color}"
+    assert blueprint == _blueprint()
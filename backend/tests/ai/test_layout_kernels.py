@@ -0,0 +1,56 @@
+"""
+LAYOUT KERNEL TESTS
+
+Tests validate:
+- find_overlaps reports exactly the pairs the original pairwise bbox check
+  reports, including touching, off-screen and negative-size boxes
+"""
+
+import random
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+import pytest
+
+from backend.ai.agent._layout_kernels import find_overlaps
+
+
+SCREEN_WIDTH = 500
+CELL = 64
+
+
+def _pairwise_overlaps(bboxes):
+    """The verifier's original O(n^2) check, as {i: sorted [j < i]}."""
+    overlaps = {}
+    for i, (x1, y1, w1, h1) in enumerate(bboxes):
+        for j, (x2, y2, w2, h2) in enumerate(bboxes[:i]):
+            if not (x1 + w1 < x2 or x2 + w2 < x1 or y1 + h1 < y2 or y2 + h2 < y1):
+                overlaps.setdefault(i, []).append(j)
+    return overlaps
+
+
+def _edges(bboxes):
+    return [(x, y, x + w, y + h) for x, y, w, h in bboxes]
+
+
+def test_touching_boxes_overlap():
+    """Shared edges and corners count; a one-pixel gap does not."""
+    bboxes = [(0, 0, 100, 50), (100, 0, 100, 50), (0, 50, 100, 50), (201, 0, 50, 50)]
+    
+    assert find_overlaps(_edges(bboxes), SCREEN_WIDTH, CELL) == {1: [0], 2: [0, 1]}
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_pairwise_check(seed):
+    """Random layouts, including off-screen, float and negative-size boxes."""
+    rng = random.Random(seed)
+    bboxes = []
+    for _ in range(rng.randint(0, 60)):
+        x = rng.choice([rng.randint(-200, 700), rng.uniform(-50, 550)])
+        y = rng.randint(-100, 900)
+        w = rng.choice([rng.randint(1, 300), rng.randint(-80, 0), CELL])
+        h = rng.choice([rng.randint(1, 200), rng.randint(-60, 0)])
+        bboxes.append((x, y, w, h))
+    
+    assert find_overlaps(_edges(bboxes), SCREEN_WIDTH, CELL) == _pairwise_overlaps(bboxes)
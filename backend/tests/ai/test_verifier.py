@@ -0,0 +1,125 @@
+"""
+VERIFIER TESTS
+
+Tests validate:
+- Token color matching by canonical hex key (case, #RGB shorthand) without
+  matching non-string colors
+- Errors are reported in check order; fail_fast stops at the first failing check
+- Identical errors are reported once and the report is capped
+- Non-dict components are reported, not raised on
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from backend.ai.agent.change_planner import ChangePlan
+from backend.ai.agent.verifier import VERIFIER
+
+
+def _verify(components, tokens=None):
+    blueprint = {"components": components, "tokens": tokens or {}}
+    return VERIFIER.verify_all(blueprint, blueprint, ChangePlan([], [], []))
+
+
+def _colored(color):
+    return [{"id": "title", "type": "header", "role": "hero", "visual": {"color": color}}]
+
+
+def test_hex_colors_match_canonically():
+    """Case and #RGB shorthand don't matter for token colors."""
+    for color in ("#0000ff", "#00F", "#ABCDEF"):
+        ok, errors = _verify(_colored(color), {"colors": {"brand": "#abcdef"}})
+        assert ok, errors
+
+
+def test_int_color_does_not_match_hex_key():
+    """255 is not #0000FF, and an int token doesn't admit the same-valued hex color."""
+    ok, errors = _verify(_colored(255))
+    assert not ok
+    assert errors == ["Component 'title': color '255' not in tokens"]
+    
+    ok, errors = _verify(_colored("#0000FE"), {"colors": {"brand": 254}})
+    assert not ok
+
+
+def _failing_components():
+    """One component per per-component check failure, plus an overlap."""
+    return [
+        {"id": "a", "type": "widget", "bbox": [0, 0, 100, 50]},
+        {"id": "b", "type": "button", "role": "cta", "visual": {"height": 30},
+         "bbox": [50, 20, 100, 50]},
+        {"id": "c", "type": "header", "visual": {"color": "#123456"}},
+    ]
+
+
+def test_errors_follow_check_order():
+    """Structure, type, accessibility, token, then layout errors."""
+    original = {"components": [{"id": "gone"}] + _failing_components()}
+    patched = {"components": _failing_components()}
+    
+    ok, errors = VERIFIER.verify_all(original, patched, ChangePlan([], [], []))
+    
+    assert not ok
+    assert errors == [
+        "Components deleted: {'gone'}",
+        "Component count changed: 4 → 3",
+        "Component 'a': invalid type 'widget'. Valid types: " + VERIFIER._VALID_TYPES_STR,
+        "CTA button 'b' height 30px < minimum 44px",
+        "Component 'c': color '#123456' not in tokens",
+        "Component 'b' overlaps with 'a'",
+    ]
+
+
+def test_fail_fast_stops_at_first_failing_check():
+    """Only the first failing check's errors are returned."""
+    blueprint = {"components": _failing_components()}
+    
+    ok, errors = VERIFIER.verify_all(blueprint, blueprint, ChangePlan([], [], []), fail_fast=True)
+    
+    assert not ok
+    assert errors == [
+        "Component 'a': invalid type 'widget'. Valid types: " + VERIFIER._VALID_TYPES_STR
+    ]
+
+
+def test_identical_errors_are_reported_once():
+    """Components sharing an id and a failure produce one message."""
+    components = [{"id": "dup", "type": "widget"} for _ in range(3)]
+    
+    ok, errors = _verify(components)
+    
+    assert not ok
+    assert errors == [
+        "Component 'dup': invalid type 'widget'. Valid types: " + VERIFIER._VALID_TYPES_STR
+    ]
+
+
+def test_error_report_is_capped():
+    """Past MAX_REPORTED_ERRORS, the remainder is summarized in one line."""
+    cap = VERIFIER.MAX_REPORTED_ERRORS
+    components = [{"id": f"c{n}", "type": "widget"} for n in range(cap + 7)]
+    
+    ok, errors = _verify(components)
+    
+    assert not ok
+    assert len(errors) == cap + 1
+    assert errors[0].startswith("Component 'c0': invalid type")
+    assert errors[cap - 1].startswith(f"Component 'c{cap - 1}': invalid type")
+    assert errors[-1] == "... 7 more errors"
+
+
+
+def test_non_dict_components_are_reported():
+    """A junk entry is an error in the structure and schema checks."""
+    original = {"components": [{"id": "a", "type": "header"}]}
+    patched = {"components": [{"id": "a", "type": "header"}, "junk"]}
+    
+    ok, errors = VERIFIER.verify_all(original, patched, ChangePlan([], [], []))
+    
+    assert not ok
+    assert errors == [
+        "Components added: {None}",
+        "Component count changed: 1 → 2",
+        "Component 1 is not a dict",
+    ]